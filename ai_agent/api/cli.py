@@ -4,14 +4,67 @@ Enhanced CLI with modern context management and type safety
 """
 
 import asyncio
+import functools
+import heapq
+import io
 import json
 import sys
+from collections import Counter
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any
 import click
+from ..core.agent import AIAgent
+from ..core.code_reader import CodeRepositoryReader
 from ..core.config import load_config
 from ..core.context_managers import ai_agent_context, process_query_simple
 from ..core.types import QueryString, ValidationError, SearchError
+from .serialization import dump_json, stream_json
+
+# uvloop is an optional speedup; fall back to the stock asyncio loop without it
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on a uvloop event loop when available"""
+    if uvloop is not None:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+
+@asynccontextmanager
+async def cli_agent() -> AsyncIterator[AIAgent]:
+    """Yield a new CLI agent and close its client connections afterwards"""
+    agent = AIAgent(load_config())
+    try:
+        yield agent
+    finally:
+        await agent.close()
+
+
+# Choice sets checked once per call with a set lookup instead of click.Choice
+_OUTPUT_FORMATS = frozenset({'text', 'json'})
+_ITEM_TYPES = frozenset({'confluence', 'jira', 'code'})
+
+
+def _check_choice(value: str, choices: frozenset, param_hint: str) -> None:
+    """Raise click's usage error when value is not one of choices"""
+    if value not in choices:
+        raise click.BadParameter(
+            f"{value!r} is not one of {', '.join(sorted(choices))}", param_hint=param_hint
+        )
+
+
+def async_command(func):
+    """Let click invoke an async command by driving it on one event loop"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_async(func(*args, **kwargs))
+    return wrapper
 
 
 @click.group()
@@ -22,14 +75,16 @@ def cli():
 
 @cli.command()
 @click.option('--config-file', help='Path to configuration file')
-def interactive(config_file):
+@click.option('--no-cache', is_flag=True, help='Always query the backends instead of reusing cached results')
+def interactive(config_file, no_cache):
     """Launch interactive problem-solving mode"""
     try:
+        # Deferred so other commands don't pay for importing the Rich UI
         from .interactive_cli import InteractiveProblemSolver
         
         click.echo("🚀 Starting AI Agent Interactive Mode...")
-        solver = InteractiveProblemSolver()
-        asyncio.run(solver.start_session())
+        solver = InteractiveProblemSolver(use_cache=not no_cache)
+        run_async(solver.start_session())
         
     except Exception as e:
         click.echo(f"❌ Error starting interactive mode: {str(e)}", err=True)
@@ -45,54 +100,53 @@ def interactive(config_file):
 @click.option('--max-results', default=10, help='Maximum results per source')
 @click.option('--jira-key-prefixes', multiple=True, help='Filter JIRA issues by key prefixes (e.g., RNDPLAN, RNDDEV)')
 @click.option('--confluence-spaces', multiple=True, help='Filter Confluence search to specific spaces')
-@click.option('--output-format', default='text', type=click.Choice(['text', 'json']), help='Output format')
+@click.option('--output-format', default='text', help='Output format (text, json)')
 @click.option('--save-to', help='Save results to file')
+@click.option('--concurrent-max', default=32, type=click.IntRange(1, 256),
+              help='Maximum concurrent backend requests for this query')
+@async_command
 async def search(query: str, no_confluence: bool, no_jira: bool, no_code: bool, 
                 file_types: tuple, max_results: int, jira_key_prefixes: tuple, 
-                confluence_spaces: tuple, output_format: str, save_to: Optional[str]):
+                confluence_spaces: tuple, output_format: str, save_to: Optional[str],
+                concurrent_max: int):
     """Search for information across Confluence, JIRA, and code repository"""
+    _check_choice(output_format, _OUTPUT_FORMATS, "'--output-format'")
     
     try:
-        # Load configuration
-        config = load_config()
-        agent = AIAgent(config)
-        
-        # Set search options
-        search_options = {
-            "search_confluence": not no_confluence,
-            "search_jira": not no_jira,
-            "search_code": not no_code,
-            "max_results": max_results,
-            "file_types": list(file_types) if file_types else None
-        }
-        
-        # Add JIRA key prefix filtering
-        if jira_key_prefixes:
-            search_options["jira_key_prefixes"] = list(jira_key_prefixes)
-        
-        # Add Confluence space filtering
-        if confluence_spaces:
-            search_options["confluence_spaces"] = list(confluence_spaces)
-        
-        click.echo(f"🔍 Searching for: {query}")
-        
-        # Process query
-        result = await agent.process_query(query, search_options)
-        
-        # Format output
-        if output_format == 'json':
-            output = json.dumps(result, indent=2, default=str)
-        else:
-            output = _format_text_output(result)
-        
-        # Save or display results
-        if save_to:
-            Path(save_to).write_text(output)
-            click.echo(f"✅ Results saved to {save_to}")
-        else:
-            click.echo(output)
-        
-        await agent.close()
+        async with cli_agent() as agent:
+            # Set search options
+            search_options = {
+                "search_confluence": not no_confluence,
+                "search_jira": not no_jira,
+                "search_code": not no_code,
+                "max_results": max_results,
+                "file_types": list(file_types) if file_types else None,
+                "max_concurrency": concurrent_max
+            }
+            
+            # Add JIRA key prefix filtering
+            if jira_key_prefixes:
+                search_options["jira_key_prefixes"] = list(jira_key_prefixes)
+            
+            # Add Confluence space filtering
+            if confluence_spaces:
+                search_options["confluence_spaces"] = list(confluence_spaces)
+            
+            click.echo(f"🔍 Searching for: {query}")
+            
+            # Process query
+            result = await agent.process_query(query, search_options)
+            
+            # Format and save or display results; saved JSON is streamed record
+            # by record so the full encoded document never sits in memory
+            if output_format == 'json' and save_to:
+                with open(save_to, 'wb', buffering=1 << 20) as fh:
+                    stream_json(result, fh)
+                click.echo(f"✅ Results saved to {save_to}")
+            elif output_format == 'json':
+                _display_or_save(dump_json(result))
+            else:
+                _display_or_save(_format_text_output(result).encode('utf-8'), save_to)
         
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
@@ -100,28 +154,27 @@ async def search(query: str, no_confluence: bool, no_jira: bool, no_code: bool,
 
 
 @cli.command()
-@click.argument('item_type', type=click.Choice(['confluence', 'jira', 'code']))
+@click.argument('item_type')
 @click.argument('item_id')
-@click.option('--output-format', default='text', type=click.Choice(['text', 'json']), help='Output format')
+@click.option('--output-format', default='text', help='Output format (text, json)')
+@async_command
 async def details(item_type: str, item_id: str, output_format: str):
-    """Get detailed information about a specific item"""
+    """Get detailed information about a specific item (confluence, jira or code)"""
+    _check_choice(item_type, _ITEM_TYPES, "'ITEM_TYPE'")
+    _check_choice(output_format, _OUTPUT_FORMATS, "'--output-format'")
     
     try:
-        config = load_config()
-        agent = AIAgent(config)
-        
         click.echo(f"📋 Getting details for {item_type}: {item_id}")
         
-        result = await agent.get_detailed_info(item_type, item_id)
-        
-        if output_format == 'json':
-            output = json.dumps(result, indent=2, default=str)
-        else:
-            output = _format_details_output(result, item_type)
-        
-        click.echo(output)
-        
-        await agent.close()
+        async with cli_agent() as agent:
+            result = await agent.get_detailed_info(item_type, item_id)
+            
+            if output_format == 'json':
+                output = dump_json(result)
+            else:
+                output = _format_details_output(result, item_type).encode('utf-8')
+            
+            _display_or_save(output)
         
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
@@ -134,8 +187,6 @@ def analyze_repo(repo_path: Optional[str]):
     """Analyze code repository structure"""
     
     try:
-        from code_reader import CodeRepositoryReader
-        
         if not repo_path:
             repo_path = load_config().code_repo_path
         
@@ -143,30 +194,33 @@ def analyze_repo(repo_path: Optional[str]):
         
         click.echo(f"📊 Analyzing repository at: {repo_path}")
         
-        # Get all files
-        all_files = reader._get_all_files()
-        
-        # Group by file type
-        file_types = {}
-        for file_path in all_files:
-            file_type = reader._get_file_type(file_path)
-            if file_type not in file_types:
-                file_types[file_type] = []
-            file_types[file_type].append(file_path)
+        # Single pass over the repository: count file types and keep a
+        # bounded min-heap of the most recently modified files
+        type_counts = Counter()
+        recent_files = []
+        total_files = 0
+        
+        for entry in reader.iter_file_entries():
+            total_files += 1
+            type_counts[reader._get_file_type(Path(entry.name))] += 1
+            
+            # DirEntry caches its stat() result from the walker's size check
+            item = (entry.stat().st_mtime, entry.path)
+            if len(recent_files) < 10:
+                heapq.heappush(recent_files, item)
+            else:
+                heapq.heappushpop(recent_files, item)
         
         # Display statistics
         click.echo(f"\n📈 Repository Statistics:")
-        click.echo(f"Total files: {len(all_files)}")
-        
-        for file_type, files in file_types.items():
-            click.echo(f"{file_type.capitalize()}: {len(files)} files")
+        click.echo(f"Total files: {total_files}")
         
-        # Show recent files
-        recent_files = sorted(all_files, key=lambda x: x.stat().st_mtime, reverse=True)[:10]
+        for file_type, count in type_counts.items():
+            click.echo(f"{file_type.capitalize()}: {count} files")
         
         click.echo(f"\n📅 Recently modified files:")
-        for file_path in recent_files:
-            relative_path = file_path.relative_to(Path(repo_path))
+        for _, file_path in sorted(recent_files, reverse=True):
+            relative_path = Path(file_path).relative_to(Path(repo_path))
             click.echo(f"  {relative_path}")
         
     except Exception as e:
@@ -213,52 +267,82 @@ def config_check():
         sys.exit(1)
 
 
+def _display_or_save(output: bytes, save_to: Optional[str] = None) -> None:
+    """Write encoded output to a file, or to stdout in a single buffered write"""
+    if save_to:
+        with open(save_to, 'wb') as fh:
+            fh.write(output)
+        click.echo(f"✅ Results saved to {save_to}")
+    else:
+        # click.echo passes bytes straight to the binary stdout buffer
+        click.echo(output)
+
+
+# Preview lengths for text output
+EXCERPT_PREVIEW_CHARS = 100
+DETAIL_PREVIEW_CHARS = 1000
+CODE_PREVIEW_CHARS = 2000
+
+
+def _truncate(value: Any, limit: int, default: str) -> str:
+    """Return at most `limit` characters of a text field, or `default` when it is missing"""
+    if value is None:
+        return default
+    # Slicing copies only the prefix, and returns the string itself when shorter
+    return value[:limit] if isinstance(value, str) else str(value)[:limit]
+
+
 def _format_text_output(result: dict) -> str:
     """Format search results as readable text"""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     
-    lines.append(f"🔍 Query: {result['query']}")
-    lines.append("=" * 50)
+    w(f"🔍 Query: {result['query']}\n")
+    w("=" * 50)
     
     if 'error' in result:
-        lines.append(f"❌ Error: {result['error']}")
-        return '\n'.join(lines)
+        w(f"\n❌ Error: {result['error']}")
+        return buf.getvalue()
     
-    # Solution
-    lines.append("💡 AI-Generated Solution:")
-    lines.append(result['solution'])
-    lines.append("")
+    # Solution - process_query returns the synthesized solution as a dict
+    solution = result['solution']
+    if isinstance(solution, dict):
+        solution = solution.get('solution', '')
+    w("\n💡 AI-Generated Solution:\n")
+    w(f"{solution}\n")
     
-    # Sources
+    # Sources - look each one up once rather than per item
     sources = result.get('sources', {})
+    confluence = sources.get('confluence', {})
+    jira = sources.get('jira', {})
+    code = sources.get('code', {})
     
-    if sources.get('confluence', {}).get('count', 0) > 0:
-        lines.append("📚 Confluence Documentation:")
-        for doc in sources['confluence']['data']:
-            lines.append(f"  • {doc.get('title', 'Unknown')}")
-            lines.append(f"    URL: {doc.get('url', 'N/A')}")
-            lines.append(f"    Excerpt: {doc.get('excerpt', 'N/A')[:100]}...")
-            lines.append("")
+    if confluence.get('count', 0) > 0:
+        w("\n📚 Confluence Documentation:")
+        for doc in confluence['data']:
+            w(f"\n  • {doc.get('title', 'Unknown')}")
+            w(f"\n    URL: {doc.get('url', 'N/A')}")
+            w(f"\n    Excerpt: {_truncate(doc.get('excerpt'), EXCERPT_PREVIEW_CHARS, 'N/A')}...\n")
     
-    if sources.get('jira', {}).get('count', 0) > 0:
-        lines.append("🎫 JIRA Issues:")
-        for issue in sources['jira']['data']:
-            lines.append(f"  • {issue.get('key', 'Unknown')}: {issue.get('summary', 'N/A')}")
-            lines.append(f"    Status: {issue.get('status', 'N/A')}")
-            lines.append(f"    URL: {issue.get('url', 'N/A')}")
-            lines.append("")
+    if jira.get('count', 0) > 0:
+        w("\n🎫 JIRA Issues:")
+        for issue in jira['data']:
+            w(f"\n  • {issue.get('key', 'Unknown')}: {issue.get('summary', 'N/A')}")
+            w(f"\n    Status: {issue.get('status', 'N/A')}")
+            w(f"\n    URL: {issue.get('url', 'N/A')}\n")
     
-    if sources.get('code', {}).get('count', 0) > 0:
-        lines.append("💻 Code Files:")
-        for code in sources['code']['data']:
-            lines.append(f"  • {code.get('file_path', 'Unknown')} ({code.get('file_type', 'unknown')})")
-            if 'matches' in code:
-                lines.append(f"    Matches: {len(code['matches'])}")
-                if code['matches']:
-                    lines.append(f"    First match: Line {code['matches'][0].get('line_number', 'N/A')}")
-            lines.append("")
+    if code.get('count', 0) > 0:
+        w("\n💻 Code Files:")
+        for code_file in code['data']:
+            w(f"\n  • {code_file.get('file_path', 'Unknown')} ({code_file.get('file_type', 'unknown')})")
+            matches = code_file.get('matches')
+            if matches is not None:
+                w(f"\n    Matches: {len(matches)}")
+                if matches:
+                    w(f"\n    First match: Line {matches[0].get('line_number', 'N/A')}")
+            w("\n")
     
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
 def _format_details_output(result: dict, item_type: str) -> str:
@@ -273,7 +357,7 @@ def _format_details_output(result: dict, item_type: str) -> str:
         lines.append(f"Space: {result.get('space', {}).get('name', 'N/A')}")
         lines.append(f"Last Modified: {result.get('version', {}).get('when', 'N/A')}")
         lines.append("Content:")
-        lines.append(result.get('body', {}).get('storage', {}).get('value', 'No content')[:1000])
+        lines.append(_truncate(result.get('body', {}).get('storage', {}).get('value'), DETAIL_PREVIEW_CHARS, 'No content'))
     
     elif item_type == 'jira':
         fields = result.get('fields', {})
@@ -283,7 +367,7 @@ def _format_details_output(result: dict, item_type: str) -> str:
         lines.append(f"Priority: {fields.get('priority', {}).get('name', 'N/A')}")
         lines.append(f"Assignee: {fields.get('assignee', {}).get('displayName', 'Unassigned')}")
         lines.append("Description:")
-        lines.append(fields.get('description', 'No description')[:1000])
+        lines.append(_truncate(fields.get('description'), DETAIL_PREVIEW_CHARS, 'No description'))
     
     elif item_type == 'code':
         lines.append(f"💻 Code File: {result.get('file_path', 'Unknown')}")
@@ -294,18 +378,14 @@ def _format_details_output(result: dict, item_type: str) -> str:
             lines.append("Analysis:")
             lines.append(json.dumps(result['analysis'], indent=2))
         lines.append("Content:")
-        lines.append(result.get('content', 'No content')[:2000])
+        lines.append(_truncate(result.get('content'), CODE_PREVIEW_CHARS, 'No content'))
     
     return '\n'.join(lines)
 
 
 def main():
     """Main entry point"""
-    # Handle async commands
-    if len(sys.argv) > 1 and sys.argv[1] in ['search', 'details']:
-        asyncio.run(cli())
-    else:
-        cli()
+    cli()
 
 
 if __name__ == '__main__':
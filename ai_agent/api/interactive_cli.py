@@ -7,8 +7,12 @@ Confluence, JIRA, and code repository data.
 """
 
 import asyncio
+import bisect
 import click
-from typing import Dict, List, Any, Optional
+import functools
+import hashlib
+import threading
+from typing import Callable, Dict, List, Any, Optional, TypeVar, Union
 import structlog
 from rich.console import Console
 from rich.panel import Panel
@@ -16,45 +20,160 @@ from rich.table import Table
 from rich.progress import track
 from rich.prompt import Prompt, Confirm
 from rich.markdown import Markdown
+from rich.live import Live
 from rich.syntax import Syntax
+from rich.text import Text
+from pygments.lexer import Lexer
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
 import json
 
 from ..core.agent import AIAgent
 from ..core.config import load_config
+from ..core.types import AIAgentError
+from ..infrastructure.cache_manager import CacheManager
+from .cli import run_async
+from .serialization import stream_json
 
 logger = structlog.get_logger(__name__)
 console = Console()
 
+T = TypeVar("T")
+
+# Per-session memo size for problem analyses and recommended strategies
+ANALYSIS_CACHE_SIZE = 256
+
+# Score grading tables: a score strictly above bins[i] earns labels[i + 1]
+SCORE_BINS = (0.6, 0.8)
+SCORE_COLORS = ("red", "yellow", "green")
+RELEVANCE_BINS = (0.4, 0.6, 0.8)
+RELEVANCE_LABELS = ("Poor", "Fair", "Good", "Excellent")
+RECENCY_LABELS = ("Older", "Moderate", "Recent", "Very Recent")
+QUALITY_BINS = (0.5, 0.7)
+QUALITY_LABELS = ("Standard", "Good Quality", "High Quality")
+
+# Styled labels for urgency and complexity levels, rendered once
+LEVEL_LABELS = {
+    level: f"[{color}]{level.upper()}[/{color}]"
+    for level, color in {"high": "red", "medium": "yellow", "low": "green"}.items()
+}
+
+# Items per source listed for drill-down; ranked results beyond this are
+# rarely useful and only slow the terminal down
+SOURCE_PREVIEW_ITEMS = 10
+
+# Bulky per-item payloads (page bodies, raw HTML, code previews) left out of
+# summary saves
+SUMMARY_DROP_FIELDS = frozenset({"content", "content_preview", "storage", "view", "export_view"})
+
+# Static screens are built once; the markup is parsed up front rather than on
+# every redraw of the interactive loop
+_WELCOME_PANEL = Panel.fit(
+    Text.from_markup(
+        "[bold blue]🤖 AI Agent Interactive Problem Solver[/bold blue]\n"
+        "I'll help you analyze problems by searching through your:\n"
+        "• 📚 Confluence documentation\n"
+        "• 🎫 JIRA issues\n"
+        "• 💻 Code repository\n\n"
+        "Then provide comprehensive solutions with implementation steps."
+    ),
+    title="Welcome",
+    border_style="blue"
+)
+
+_MAIN_MENU_PANEL = Panel(
+    Text.from_markup(
+        "[bold]Choose an option:[/bold]\n\n"
+        "1. 🎯 Guided Problem Solving (Recommended)\n"
+        "2. 🔍 Quick Search\n"
+        "3. 📂 Browse Sources\n"
+        "4. 📈 View Search History\n"
+        "5. ❓ Help\n"
+        "6. 🚪 Exit"
+    ),
+    title="Main Menu",
+    border_style="green"
+)
+
+_MAIN_MENU_CHOICES = ["1", "2", "3", "4", "5", "6"]
+
+_HELP_PANEL = Panel(Text.from_markup("""
+[bold blue]🤖 AI Agent Interactive Help[/bold blue]
+
+[bold]What does this tool do?[/bold]
+The AI Agent helps you solve problems by intelligently searching through your:
+• Confluence documentation
+• JIRA issues and tickets
+• Source code repository
+
+It then uses AI to analyze all the found information and provide comprehensive solutions.
+
+[bold]Features:[/bold]
+• Intelligent problem categorization
+• Multi-source search optimization
+• Structured solution generation
+• Implementation step guidance
+• Risk assessment
+• Related issue detection
+
+[bold]Tips for best results:[/bold]
+• Be specific about your problem
+• Include error messages if applicable
+• Mention the technologies involved
+• Describe the context (environment, recent changes, etc.)
+
+[bold]Search Strategy:[/bold]
+The tool automatically determines the best search strategy based on your problem type:
+• Documentation issues → Focus on Confluence
+• Bugs/errors → Focus on JIRA and code
+• Performance issues → Focus on code and related tickets
+• Configuration problems → Search all sources
+
+[bold]Getting Started:[/bold]
+1. Use "Guided Problem Solving" for complex issues
+2. Use "Quick Search" for simple lookups
+3. Always review the problem analysis before searching
+4. Explore detailed source information when needed
+"""), border_style="blue")
+
 
 class InteractiveProblemSolver:
     """Interactive problem solver with guided workflow"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.config = load_config()
         self.agent = None
+        # Query results persisted across sessions in the file cache, so
+        # refined and repeated searches skip the backends
+        self.query_cache: Optional[CacheManager] = None
+        if use_cache and self.config.enable_file_cache:
+            self.query_cache = CacheManager({
+                'memory_cache_size': ANALYSIS_CACHE_SIZE,
+                'file_cache_dir': self.config.file_cache_dir,
+                'query_cache_ttl': self.config.cache_ttl_medium
+            })
+        # Analyses and strategies memoised for the session; re-running a
+        # tweaked query usually repeats the same problem text
+        self._analysis_cache: Dict[str, Dict[str, Any]] = {}
+        self._strategy_cache: Dict[str, Dict[str, Any]] = {}
     
     async def start_session(self):
         """Start interactive problem-solving session"""
         
-        console.print(Panel.fit(
-            "[bold blue]🤖 AI Agent Interactive Problem Solver[/bold blue]\n"
-            "I'll help you analyze problems by searching through your:\n"
-            "• 📚 Confluence documentation\n"
-            "• 🎫 JIRA issues\n"
-            "• 💻 Code repository\n\n"
-            "Then provide comprehensive solutions with implementation steps.",
-            title="Welcome",
-            border_style="blue"
-        ))
+        console.print(_WELCOME_PANEL)
         
         try:
-            # Initialize agent
+            # Initialize agent; building the clients (SSL contexts, NLP models)
+            # runs off the loop, and connections open in the background while
+            # the menu is up
             console.print("🔄 Initializing AI agent...")
-            self.agent = AIAgent(self.config)
+            self.agent = await asyncio.to_thread(AIAgent, self.config)
+            warmup = asyncio.create_task(self.agent.initialize())
+            warmup.add_done_callback(_log_warmup_failure)
             
             while True:
                 console.print("\n" + "="*60)
-                choice = self._main_menu()
+                choice = await _off_loop(self._main_menu)
                 
                 if choice == "1":
                     await self._guided_problem_solving()
@@ -71,7 +190,9 @@ class InteractiveProblemSolver:
                 else:
                     console.print("[red]Invalid choice. Please try again.[/red]")
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Under run_async, Ctrl-C cancels this task rather than raising
+            # KeyboardInterrupt here; ending normally lets the session close
             console.print("\n[yellow]Session interrupted by user.[/yellow]")
         except Exception as e:
             console.print(f"[red]Error: {str(e)}[/red]")
@@ -83,19 +204,9 @@ class InteractiveProblemSolver:
     def _main_menu(self) -> str:
         """Display main menu and get user choice"""
         
-        console.print(Panel(
-            "[bold]Choose an option:[/bold]\n\n"
-            "1. 🎯 Guided Problem Solving (Recommended)\n"
-            "2. 🔍 Quick Search\n"
-            "3. 📂 Browse Sources\n"
-            "4. 📈 View Search History\n"
-            "5. ❓ Help\n"
-            "6. 🚪 Exit",
-            title="Main Menu",
-            border_style="green"
-        ))
+        console.print(_MAIN_MENU_PANEL)
         
-        return Prompt.ask("Enter your choice", choices=["1", "2", "3", "4", "5", "6"], default="1")
+        return Prompt.ask("Enter your choice", choices=_MAIN_MENU_CHOICES, default="1")
     
     async def _guided_problem_solving(self):
         """Guided problem-solving workflow"""
@@ -106,27 +217,38 @@ class InteractiveProblemSolver:
             border_style="green"
         ))
         
-        # Step 1: Problem description
-        problem_description = self._get_problem_description()
+        # Step 1: Problem description; the session's background warm-up keeps
+        # connecting while the user types
+        problem_description = await self._get_problem_description()
         
-        # Step 2: Problem analysis preview
+        # Step 2: Problem analysis preview, while the backend connections
+        # finish opening so the search can start as soon as it is confirmed
         console.print("\n🔍 Analyzing your problem...")
-        problem_analysis = await self._preview_problem_analysis(problem_description)
+        async with asyncio.TaskGroup() as tg:
+            analysis_task = tg.create_task(self._preview_problem_analysis(problem_description))
+            tg.create_task(self._await_warmup())
+        problem_analysis = analysis_task.result()
         
-        # Step 3: Confirm search strategy
-        search_strategy = self._confirm_search_strategy(problem_analysis)
+        # Step 3: Confirm search strategy; the prompts run off the loop so
+        # background work keeps going while the user decides
+        search_strategy = await _off_loop(self._confirm_search_strategy, problem_analysis)
         
-        # Step 4: Execute comprehensive search
+        # Step 4: Search, presenting sources as soon as they are ranked and
+        # the solution as it is generated
         console.print("\n🚀 Searching across all sources...")
         result = await self._execute_comprehensive_search(problem_description, search_strategy)
         
-        # Step 5: Present results
-        await self._present_comprehensive_results(result)
-        
-        # Step 6: Follow-up options
+        # Step 5: Follow-up options
         await self._follow_up_options(result)
     
-    def _get_problem_description(self) -> str:
+    async def _await_warmup(self):
+        """Wait for the agent's connections; a failure was already logged by the warm-up"""
+        try:
+            await self.agent.initialize()
+        except AIAgentError:
+            pass  # process_query retries initialization and reports the failure
+    
+    async def _get_problem_description(self) -> str:
         """Get detailed problem description from user"""
         
         console.print("\n📝 [bold]Describe your problem:[/bold]")
@@ -139,7 +261,8 @@ class InteractiveProblemSolver:
         console.print("\n[yellow]Enter your problem description (press Enter twice when finished):[/yellow]")
         lines = []
         while True:
-            line = input()
+            # Read off the event loop so background work keeps running
+            line = await _off_loop(input)
             if line.strip() == "" and len(lines) > 0 and lines[-1].strip() == "":
                 lines = lines[:-1]  # Remove the last empty line
                 break
@@ -170,7 +293,7 @@ class InteractiveProblemSolver:
         """Preview problem analysis before search"""
         
         # Get initial analysis from agent
-        analysis = await self.agent._analyze_problem(problem)
+        analysis = await self._analyze_problem(problem)
         
         # Create analysis table
         table = Table(title="Problem Analysis", show_header=True)
@@ -187,21 +310,41 @@ class InteractiveProblemSolver:
         
         return analysis
     
+    async def _analyze_problem(self, problem: str) -> Dict[str, Any]:
+        """Analyze a problem through the agent, reusing earlier analyses of the same text"""
+        key = hashlib.sha1(problem.encode('utf-8')).hexdigest()
+        analysis = self._analysis_cache.get(key)
+        if analysis is None:
+            analysis = await self.agent._analyze_problem(problem)
+            _remember(self._analysis_cache, key, analysis)
+        return analysis
+    
+    def _recommended_strategy(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the agent's strategy for an analysis, memoised unless the analysis is timestamped"""
+        if "timestamp" in analysis:
+            return self.agent._determine_search_strategy(analysis)
+        
+        key = json.dumps(analysis, sort_keys=True, default=str)
+        strategy = self._strategy_cache.get(key)
+        if strategy is None:
+            strategy = self.agent._determine_search_strategy(analysis)
+            _remember(self._strategy_cache, key, strategy)
+        # Callers customise the strategy in place, so hand out a copy
+        return dict(strategy)
+    
     def _format_urgency(self, urgency: str) -> str:
         """Format urgency with appropriate styling"""
-        colors = {"high": "red", "medium": "yellow", "low": "green"}
-        return f"[{colors.get(urgency, 'white')}]{urgency.upper()}[/{colors.get(urgency, 'white')}]"
+        return LEVEL_LABELS.get(urgency) or f"[white]{urgency.upper()}[/white]"
     
     def _format_complexity(self, complexity: str) -> str:
         """Format complexity with appropriate styling"""
-        colors = {"high": "red", "medium": "yellow", "low": "green"}
-        return f"[{colors.get(complexity, 'white')}]{complexity.upper()}[/{colors.get(complexity, 'white')}]"
+        return LEVEL_LABELS.get(complexity) or f"[white]{complexity.upper()}[/white]"
     
     def _confirm_search_strategy(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Allow user to confirm or modify search strategy"""
         
         # Get recommended strategy
-        strategy = self.agent._determine_search_strategy(analysis)
+        strategy = self._recommended_strategy(analysis)
         
         console.print("\n📋 [bold]Recommended Search Strategy:[/bold]")
         
@@ -228,6 +371,10 @@ class InteractiveProblemSolver:
         
         console.print(strategy_table)
         
+        # Concurrent backend requests are capped agent-wide by configuration
+        max_concurrent = self.config.max_concurrent_searches
+        console.print(f"⚡ Concurrent backend requests: {strategy.get('max_concurrency', max_concurrent)} (limit {max_concurrent})")
+        
         if Confirm.ask("\nUse recommended strategy?", default=True):
             return strategy
         
@@ -244,36 +391,96 @@ class InteractiveProblemSolver:
         except ValueError:
             strategy["max_results"] = 10
         
+        concurrency = Prompt.ask(
+            f"Concurrent backend requests (1-{max_concurrent})",
+            default=str(strategy.get("max_concurrency", max_concurrent))
+        )
+        try:
+            strategy["max_concurrency"] = min(max(int(concurrency), 1), max_concurrent)
+        except ValueError:
+            strategy.pop("max_concurrency", None)
+        
         return strategy
     
     async def _execute_comprehensive_search(self, problem: str, strategy: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute comprehensive search with progress tracking"""
+        """Execute comprehensive search, presenting ranked sources first and streaming the solution"""
         
-        with console.status("[bold green]🔍 Searching across sources...") as status:
-            result = await self.agent.process_query(problem, strategy)
-            status.update("[bold green]✅ Search completed!")
+        cached = await self._cached_query(problem, strategy)
+        if cached is not None:
+            await self._present_comprehensive_results(cached)
+            return cached
         
+        events = self.agent.process_query_streaming(problem, strategy)
+        with console.status("[bold green]🔍 Searching across sources..."):
+            first = await anext(events)
+        
+        result = first["result"]
+        self._show_overview(result)
+        
+        console.print("\n" + "="*60)
+        # Tokens are appended to one plain Text that Live redraws on its own
+        # refresh tick; Markdown re-parses everything, so it renders once at the end
+        streamed = Text()
+        with Live(_solution_panel("_Generating solution..._"), console=console, refresh_per_second=8) as live:
+            async for event in events:
+                if event["type"] == "token":
+                    if not streamed:
+                        live.update(_solution_panel(streamed))
+                    streamed.append(event["text"])
+                else:
+                    # Settle on the parsed solution section once generation ends
+                    result = event["result"]
+                    live.update(_solution_panel(result["solution"].get("solution", streamed.plain)))
+        
+        self._show_solution_details(result)
+        await self._cache_query(problem, strategy, result)
         return result
     
+    async def _process_query(
+        self, query: str, options: Optional[Dict[str, Any]] = None, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Run a query through the agent, serving repeats of (query, options) from the query cache"""
+        if use_cache:
+            result = await self._cached_query(query, options)
+            if result is not None:
+                return result
+        
+        result = await self.agent.process_query(query, options)
+        await self._cache_query(query, options, result)
+        return result
+    
+    async def _cached_query(self, query: str, options: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Look up a cached result for (query, options)"""
+        if self.query_cache is None:
+            return None
+        return await self.query_cache.get(_query_cache_key(query, options), 'query')
+    
+    async def _cache_query(self, query: str, options: Optional[Dict[str, Any]], result: Dict[str, Any]) -> None:
+        """Cache the result for (query, options)"""
+        if self.query_cache is not None:
+            await self.query_cache.set(_query_cache_key(query, options), result, 'query')
+    
     async def _present_comprehensive_results(self, result: Dict[str, Any]):
         """Present comprehensive results in a user-friendly format"""
         
+        self._show_overview(result)
+        
+        # Show main solution
+        console.print("\n" + "="*60)
+        console.print(_solution_panel(_solution_of(result).get("solution", "No solution generated")))
+        
+        self._show_solution_details(result)
+    
+    def _show_overview(self, result: Dict[str, Any]):
+        """Show the problem analysis and ranked sources"""
+        
         console.print("\n" + "="*60)
         console.print(Panel.fit(
             "[bold green]🎉 Analysis Complete![/bold green]",
             border_style="green"
         ))
         
-        # Show problem analysis
-        analysis = result.get("problem_analysis", {})
-        console.print(f"\n📊 [bold]Problem Category:[/bold] {analysis.get('problem_category', 'general').title()}")
-        console.print(f"⏰ [bold]Urgency:[/bold] {self._format_urgency(analysis.get('urgency', 'medium'))}")
-        console.print(f"🧠 [bold]Complexity:[/bold] {self._format_complexity(analysis.get('complexity', 'medium'))}")
-        
-        # Show confidence score
-        confidence = result.get("confidence_score", 0.0)
-        confidence_color = "green" if confidence > 0.7 else "yellow" if confidence > 0.4 else "red"
-        console.print(f"📈 [bold]Confidence Score:[/bold] [{confidence_color}]{confidence:.1%}[/{confidence_color}]")
+        self._show_problem_analysis(result.get("problem_analysis", {}))
         
         # Show ranking insights if available
         ranking_insights = result.get("ranking_insights", {})
@@ -283,31 +490,68 @@ class InteractiveProblemSolver:
         # Show sources summary
         sources = result.get("sources", {})
         self._show_sources_summary(sources)
+    
+    def _show_solution_details(self, result: Dict[str, Any]):
+        """Show the solution's confidence, steps, risks and related issues"""
         
-        # Show main solution
-        console.print("\n" + "="*60)
-        solution = result.get("solution", "No solution generated")
-        console.print(Panel(
-            Markdown(solution),
-            title="💡 Recommended Solution",
-            border_style="blue"
-        ))
+        solution = _solution_of(result)
+        
+        self._show_confidence(solution.get("confidence", 0.0))
         
         # Show implementation steps
-        steps = result.get("implementation_steps", [])
+        steps = solution.get("steps", [])
         if steps:
             self._show_implementation_steps(steps)
         
         # Show risks
-        risks = result.get("risk_assessment", [])
+        risks = solution.get("risks", [])
         if risks:
             self._show_risk_assessment(risks)
         
         # Show related issues
-        related = result.get("related_issues", [])
+        related = solution.get("related_issues", [])
         if related:
             self._show_related_issues(related)
     
+    async def _present_diff(self, old: Dict[str, Any], new: Dict[str, Any]):
+        """Present a result against one already on screen, redrawing only the sections that changed"""
+        
+        console.print("\n" + "="*60)
+        for label, select, show in self._result_sections():
+            value = select(new)
+            if _digest(value) == _digest(select(old)):
+                console.print(f"[dim]{label} (unchanged)[/dim]")
+            elif value:
+                show(value)
+            else:
+                console.print(f"[dim]{label}: none[/dim]")
+    
+    def _result_sections(self) -> tuple:
+        """Return (label, selector, renderer) for each independently drawn section of a result"""
+        return (
+            ("Problem analysis", lambda r: r.get("problem_analysis", {}), self._show_problem_analysis),
+            ("Ranking insights", lambda r: r.get("ranking_insights", {}), self._show_ranking_insights),
+            ("Sources", lambda r: r.get("sources", {}), self._show_sources_summary),
+            ("Solution", lambda r: _solution_of(r).get("solution", ""), lambda text: console.print(_solution_panel(text))),
+            ("Confidence", lambda r: _solution_of(r).get("confidence", 0.0), self._show_confidence),
+            ("Implementation steps", lambda r: _solution_of(r).get("steps", []), self._show_implementation_steps),
+            ("Risks", lambda r: _solution_of(r).get("risks", []), self._show_risk_assessment),
+            ("Related issues", lambda r: _solution_of(r).get("related_issues", []), self._show_related_issues),
+        )
+    
+    def _show_problem_analysis(self, analysis: Dict[str, Any]):
+        """Show the problem category, urgency and complexity"""
+        
+        console.print(f"\n📊 [bold]Problem Category:[/bold] {analysis.get('problem_category', 'general').title()}")
+        console.print(f"⏰ [bold]Urgency:[/bold] {self._format_urgency(analysis.get('urgency', 'medium'))}")
+        console.print(f"🧠 [bold]Complexity:[/bold] {self._format_complexity(analysis.get('complexity', 'medium'))}")
+    
+    def _show_confidence(self, confidence: float):
+        """Show the solution confidence score"""
+        
+        confidence_color = "green" if confidence > 0.7 else "yellow" if confidence > 0.4 else "red"
+        console.print(f"\n📈 [bold]Confidence Score:[/bold] [{confidence_color}]{confidence:.1%}[/{confidence_color}]")
+    
     def _show_ranking_insights(self, ranking_insights: Dict[str, Any]):
         """Show advanced ranking insights"""
         
@@ -322,15 +566,15 @@ class InteractiveProblemSolver:
             insights_table.add_column("Assessment", style="dim")
             
             content_rel = ranking_summary.get("average_content_relevance", 0)
-            content_assess = "Excellent" if content_rel > 0.8 else "Good" if content_rel > 0.6 else "Fair" if content_rel > 0.4 else "Poor"
+            content_assess = _grade(content_rel, RELEVANCE_BINS, RELEVANCE_LABELS)
             insights_table.add_row("Content Relevance", f"{content_rel:.1%}", content_assess)
             
             recency = ranking_summary.get("average_recency_score", 0)
-            recency_assess = "Very Recent" if recency > 0.8 else "Recent" if recency > 0.6 else "Moderate" if recency > 0.4 else "Older"
+            recency_assess = _grade(recency, RELEVANCE_BINS, RECENCY_LABELS)
             insights_table.add_row("Content Recency", f"{recency:.1%}", recency_assess)
             
             quality = ranking_summary.get("average_quality_score", 0)
-            quality_assess = "High Quality" if quality > 0.7 else "Good Quality" if quality > 0.5 else "Standard"
+            quality_assess = _grade(quality, QUALITY_BINS, QUALITY_LABELS)
             insights_table.add_row("Content Quality", f"{quality:.1%}", quality_assess)
             
             console.print(insights_table)
@@ -378,14 +622,8 @@ class InteractiveProblemSolver:
                 if data and len(data) > 0:
                     first_item_score = data[0].get("ranking_score", 0)
                     if first_item_score > 0:
-                        top_score = f"{first_item_score:.1%}"
-                        # Add color coding
-                        if first_item_score > 0.8:
-                            top_score = f"[green]{top_score}[/green]"
-                        elif first_item_score > 0.6:
-                            top_score = f"[yellow]{top_score}[/yellow]"
-                        else:
-                            top_score = f"[red]{top_score}[/red]"
+                        color = _grade(first_item_score, SCORE_BINS, SCORE_COLORS)
+                        top_score = f"[{color}]{first_item_score:.1%}[/{color}]"
 
                 sources_table.add_row(
                     source_name.title(),
@@ -406,23 +644,21 @@ class InteractiveProblemSolver:
     def _show_implementation_steps(self, steps: List[str]):
         """Show implementation steps"""
         
-        console.print("\n📋 [bold]Implementation Steps:[/bold]")
-        for i, step in enumerate(steps, 1):
-            console.print(f"{i}. {step}")
+        # One print per section: each console.print pays for its own render and flush
+        lines = [f"{i}. {step}" for i, step in enumerate(steps, 1)]
+        console.print("\n".join(["\n📋 [bold]Implementation Steps:[/bold]", *lines]))
     
     def _show_risk_assessment(self, risks: List[str]):
         """Show risk assessment"""
         
-        console.print("\n⚠️ [bold yellow]Risk Assessment:[/bold yellow]")
-        for risk in risks:
-            console.print(f"• [yellow]{risk}[/yellow]")
+        lines = [f"• [yellow]{risk}[/yellow]" for risk in risks]
+        console.print("\n".join(["\n⚠️ [bold yellow]Risk Assessment:[/bold yellow]", *lines]))
     
     def _show_related_issues(self, related: List[str]):
         """Show related issues"""
         
-        console.print("\n🔗 [bold]Related Issues to Consider:[/bold]")
-        for issue in related:
-            console.print(f"• {issue}")
+        lines = [f"• {issue}" for issue in related]
+        console.print("\n".join(["\n🔗 [bold]Related Issues to Consider:[/bold]", *lines]))
     
     async def _follow_up_options(self, result: Dict[str, Any]):
         """Provide follow-up options"""
@@ -473,15 +709,15 @@ class InteractiveProblemSolver:
             console.print(f"{i}. {source.title()}")
         
         try:
-            choice_idx = int(Prompt.ask("Choose source type", choices=[str(i) for i in range(1, len(available_sources) + 1)])) - 1
+            choice_idx = int(Prompt.ask("Choose source type", choices=_index_choices(len(available_sources)))) - 1
             chosen_source = available_sources[choice_idx]
         except (ValueError, IndexError):
             console.print("[red]Invalid choice.[/red]")
             return
         
-        # Show available items
+        # Show available items, best ranked first
         source_data = sources[chosen_source]
-        items = source_data.get("data", [])
+        items = source_data.get("data", [])[:SOURCE_PREVIEW_ITEMS]
         
         console.print(f"\n📋 [bold]{chosen_source.title()} Items:[/bold]")
         for i, item in enumerate(items, 1):
@@ -493,7 +729,7 @@ class InteractiveProblemSolver:
                 console.print(f"{i}. {item.get('file_path', 'N/A')}")
         
         try:
-            item_idx = int(Prompt.ask("Choose item", choices=[str(i) for i in range(1, len(items) + 1)])) - 1
+            item_idx = int(Prompt.ask("Choose item", choices=_index_choices(len(items)))) - 1
             chosen_item = items[item_idx]
         except (ValueError, IndexError):
             console.print("[red]Invalid choice.[/red]")
@@ -553,7 +789,7 @@ class InteractiveProblemSolver:
         
         console.print(f"\n📁 [bold]File:[/bold] {file_path}")
         console.print(Panel(
-            Syntax(content, file_type, theme="monokai", line_numbers=True),
+            Syntax(content, _code_lexer(file_type), theme=_CODE_THEME, line_numbers=True),
             title="💻 Code Content",
             border_style="green"
         ))
@@ -584,22 +820,28 @@ class InteractiveProblemSolver:
             except ValueError:
                 search_options["max_results"] = 10
         
+        use_cache = self.query_cache is None or not Confirm.ask("Bypass cached results?", default=False)
+        
         # Execute refined search
         console.print("\n🔄 Executing refined search...")
-        refined_result = await self.agent.process_query(new_query, search_options)
+        refined_result = await self._process_query(new_query, search_options, use_cache)
         
-        # Present refined results
-        await self._present_comprehensive_results(refined_result)
+        # The original results are still on screen, so only redraw what changed
+        await self._present_diff(original_result, refined_result)
         await self._follow_up_options(refined_result)
     
     def _save_results(self, result: Dict[str, Any]):
         """Save results to file"""
         
         filename = Prompt.ask("Enter filename", default="ai_agent_results.json")
+        if not Confirm.ask("Save full results? (No saves a summary without page and code bodies)", default=True):
+            result = _summarize_result(result)
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(result, f, indent=2, default=str)
+            # Streamed record by record, like `search --save-to`, so large
+            # source payloads are never encoded into one in-memory document
+            with open(filename, 'wb', buffering=1 << 20) as f:
+                stream_json(result, f)
             console.print(f"✅ Results saved to {filename}")
         except Exception as e:
             console.print(f"[red]Error saving file: {e}[/red]")
@@ -624,20 +866,37 @@ class InteractiveProblemSolver:
             console.print(f"{i}. {query}")
         
         if Confirm.ask("Execute one of these searches?", default=True):
+            choices = [*_index_choices(len(related_queries)), "all"]
+            choice = Prompt.ask("Choose query (or 'all' to run every suggestion)", choices=choices)
+            
+            if choice == "all":
+                await self._run_related_searches(related_queries)
+                return
+            
             try:
-                choice_idx = int(Prompt.ask("Choose query", choices=[str(i) for i in range(1, len(related_queries) + 1)])) - 1
-                chosen_query = related_queries[choice_idx]
+                chosen_query = related_queries[int(choice) - 1]
             except (ValueError, IndexError):
                 console.print("[red]Invalid choice.[/red]")
                 return
             
             # Execute related search
             console.print(f"\n🔄 Searching for: {chosen_query}")
-            related_result = await self.agent.process_query(chosen_query)
+            related_result = await self._process_query(chosen_query)
             
             await self._present_comprehensive_results(related_result)
             await self._follow_up_options(related_result)
     
+    async def _run_related_searches(self, queries: List[str]):
+        """Run several related searches concurrently, presenting each as it finishes"""
+        
+        console.print(f"\n🔄 Running {len(queries)} related searches...")
+        async for query, related_result in self.agent.process_queries_batch(queries):
+            console.print(f"\n🔎 [bold]Results for:[/bold] {query}")
+            if isinstance(related_result, Exception):
+                console.print(f"[red]Search failed: {related_result}[/red]")
+                continue
+            await self._present_comprehensive_results(related_result)
+    
     async def _quick_search(self):
         """Quick search without guided workflow"""
         
@@ -650,7 +909,7 @@ class InteractiveProblemSolver:
         query = Prompt.ask("Enter your search query")
         
         console.print("\n🚀 Searching...")
-        result = await self.agent.process_query(query)
+        result = await self._process_query(query)
         
         await self._present_comprehensive_results(result)
         await self._follow_up_options(result)
@@ -688,56 +947,119 @@ class InteractiveProblemSolver:
     def _show_help(self):
         """Show help information"""
         
-        help_content = """
-[bold blue]🤖 AI Agent Interactive Help[/bold blue]
+        console.print(_HELP_PANEL)
 
-[bold]What does this tool do?[/bold]
-The AI Agent helps you solve problems by intelligently searching through your:
-• Confluence documentation
-• JIRA issues and tickets
-• Source code repository
 
-It then uses AI to analyze all the found information and provide comprehensive solutions.
+async def _off_loop(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking prompt in a daemon thread while the event loop keeps running.
+    
+    Unlike asyncio.to_thread, a prompt abandoned by Ctrl-C does not hold up
+    interpreter shutdown waiting for the user to press Enter.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter: Callable[[Any], None], value: Any) -> None:
+        if not future.done():
+            setter(value)
+    
+    def run() -> None:
+        try:
+            outcome = (future.set_result, func(*args))
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(deliver, *outcome)
+        except RuntimeError:
+            pass  # the session ended while the prompt was open
+    
+    threading.Thread(target=run, daemon=True).start()
+    return await future
 
-[bold]Features:[/bold]
-• Intelligent problem categorization
-• Multi-source search optimization
-• Structured solution generation
-• Implementation step guidance
-• Risk assessment
-• Related issue detection
 
-[bold]Tips for best results:[/bold]
-• Be specific about your problem
-• Include error messages if applicable
-• Mention the technologies involved
-• Describe the context (environment, recent changes, etc.)
+# Code views share one resolved theme and one lexer per file type
+_CODE_THEME = Syntax.get_theme("monokai")
 
-[bold]Search Strategy:[/bold]
-The tool automatically determines the best search strategy based on your problem type:
-• Documentation issues → Focus on Confluence
-• Bugs/errors → Focus on JIRA and code
-• Performance issues → Focus on code and related tickets
-• Configuration problems → Search all sources
 
-[bold]Getting Started:[/bold]
-1. Use "Guided Problem Solving" for complex issues
-2. Use "Quick Search" for simple lookups
-3. Always review the problem analysis before searching
-4. Explore detailed source information when needed
-"""
-        
-        console.print(Panel(help_content, border_style="blue"))
+@functools.lru_cache(maxsize=32)
+def _code_lexer(file_type: str) -> Lexer:
+    """Resolve the Pygments lexer for a file type once, falling back to plain text"""
+    try:
+        return get_lexer_by_name(file_type)
+    except ClassNotFound:
+        return TextLexer()
+
+
+@functools.lru_cache(maxsize=64)
+def _index_choices(count: int) -> tuple:
+    """Return the prompt choices "1".."count", shared between prompts of the same length"""
+    return tuple(str(i) for i in range(1, count + 1))
+
+
+def _solution_panel(text: Union[str, Text]) -> Panel:
+    """Render solution text as the recommended-solution panel; a Text is shown as-is, without Markdown"""
+    body = text if isinstance(text, Text) else Markdown(text)
+    return Panel(body, title="💡 Recommended Solution", border_style="blue")
+
+
+def _solution_of(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the structured solution of a query result"""
+    return result.get("solution") or {}
+
+
+def _query_cache_key(query: str, options: Optional[Dict[str, Any]]) -> str:
+    """Key a query result by the query and its sorted options"""
+    return f"{query}|{json.dumps(options, sort_keys=True, default=str)}"
+
+
+def _digest(value: Any) -> bytes:
+    """Fingerprint a JSON-serializable value independently of key order"""
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode('utf-8'), digest_size=16).digest()
+
+
+def _summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a result with each source item stripped of its bulky payload fields"""
+    sources = {
+        name: {
+            **source,
+            "data": [
+                {key: value for key, value in item.items() if key not in SUMMARY_DROP_FIELDS}
+                for item in source.get("data", [])
+            ]
+        }
+        for name, source in result.get("sources", {}).items()
+    }
+    return {**result, "sources": sources}
+
+
+def _log_warmup_failure(task: asyncio.Task) -> None:
+    """Log a failed background agent warm-up; process_query retries initialization"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Agent warm-up failed", error=str(task.exception()))
+
+
+def _grade(score: float, bins: tuple, labels: tuple) -> str:
+    """Map a score onto labels by the number of bin thresholds it exceeds"""
+    return labels[bisect.bisect_left(bins, score)]
+
+
+def _remember(cache: Dict[str, Dict[str, Any]], key: str, value: Dict[str, Any]) -> None:
+    """Store a value in a session cache, evicting the oldest entry once it is full"""
+    if len(cache) >= ANALYSIS_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
 
 
 @click.command()
 @click.option('--config-file', help='Path to configuration file')
-def interactive_cli(config_file):
+@click.option('--no-cache', is_flag=True, help='Always query the backends instead of reusing cached results')
+def interactive_cli(config_file, no_cache):
     """Launch interactive AI Agent CLI"""
     
     try:
-        solver = InteractiveProblemSolver()
-        asyncio.run(solver.start_session())
+        solver = InteractiveProblemSolver(use_cache=not no_cache)
+        run_async(solver.start_session())
     except Exception as e:
         console.print(f"[red]Failed to start interactive session: {e}[/red]")
 
@@ -0,0 +1,47 @@
+"""
+JSON serialization shared by the command-line interfaces
+"""
+
+from typing import Any
+import orjson
+
+
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Container nesting streamed by stream_json: result -> sources -> source -> data
+_STREAM_JSON_DEPTH = 4
+
+
+def dump_json(result: Any) -> bytes:
+    """Serialize a result for JSON output as indented UTF-8 bytes"""
+    return orjson.dumps(result, default=str, option=_JSON_OPTIONS | orjson.OPT_INDENT_2)
+
+
+def _json_key(key: Any) -> bytes:
+    """Encode a dict key as dump_json does, including orjson's handling of non-str keys"""
+    if isinstance(key, str):
+        return orjson.dumps(key)
+    # b'{<key>:null}' -> b'<key>'
+    return orjson.dumps({key: None}, default=str, option=_JSON_OPTIONS)[1:-len(b':null}')]
+
+
+def stream_json(obj: Any, fh, depth: int = 0) -> None:
+    """Write obj to a binary file as JSON, serializing the outer containers piecewise"""
+    if depth < _STREAM_JSON_DEPTH and isinstance(obj, dict):
+        fh.write(b'{')
+        for i, (key, value) in enumerate(obj.items()):
+            if i:
+                fh.write(b',')
+            fh.write(_json_key(key))
+            fh.write(b':')
+            stream_json(value, fh, depth + 1)
+        fh.write(b'}')
+    elif depth < _STREAM_JSON_DEPTH and isinstance(obj, (list, tuple)):
+        fh.write(b'[')
+        for i, item in enumerate(obj):
+            if i:
+                fh.write(b',')
+            stream_json(item, fh, depth + 1)
+        fh.write(b']')
+    else:
+        fh.write(orjson.dumps(obj, default=str, option=_JSON_OPTIONS))
@@ -1,24 +1,29 @@
 import asyncio
+import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
+import orjson
 import uvicorn
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 import structlog
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
 
 from ..core.agent import AIAgent
 from ..core.config import load_config
 from ..core.query_processor import query_processor, QueryAnalysis
 from ..infrastructure.batch_processor import batch_processor, BatchResult
 from ..infrastructure.semantic_search import semantic_search
-from ..infrastructure.monitoring import performance_monitor, metrics_collector
+from ..infrastructure.monitoring import performance_monitor, metrics_collector, logging_manager
 from ..infrastructure.cache_manager import CacheManager
+from ..infrastructure.semantic_cache import source_refs
 from ..plugins.plugin_system import plugin_manager, PluginContext, PluginEvent
 
 logger = structlog.get_logger(__name__)
@@ -29,15 +34,16 @@ class QueryRequest(BaseModel):
     search_options: Optional[Dict[str, Any]] = Field(default=None, description="Search options")
     use_cache: bool = Field(default=True, description="Whether to use caching")
     
-    @validator('query')
-    def validate_query(cls, v):
+    @field_validator('query')
+    @classmethod
+    def validate_query(cls, v: str) -> str:
         if not v or not v.strip():
             raise ValueError('Query cannot be empty')
         return v.strip()
 
 
 class BatchQueryRequest(BaseModel):
-    queries: List[str] = Field(..., min_items=1, max_items=50, description="List of queries to process")
+    queries: List[str] = Field(..., min_length=1, max_length=50, description="List of queries to process")
     search_options: Optional[Dict[str, Any]] = Field(default=None, description="Search options for all queries")
     callback_url: Optional[str] = Field(default=None, description="URL to call when batch is complete")
 
@@ -88,7 +94,8 @@ app = FastAPI(
     description="Advanced AI agent for searching Confluence, JIRA, and code repositories",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Middleware
@@ -105,11 +112,68 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 # Authentication
 security = HTTPBearer(auto_error=False)
 
+# Request logging: polled endpoints bypass the logging middleware entirely,
+# and identical successful requests are logged once per window
+UNLOGGED_PATHS = frozenset({"/metrics", "/health"})
+REQUEST_LOG_REPEAT_WINDOW = 5.0
+_recent_requests: TTLCache = TTLCache(maxsize=4096, ttl=REQUEST_LOG_REPEAT_WINDOW)
+
+# Generated /metrics payload and when it was generated (monotonic seconds)
+METRICS_SNAPSHOT_TTL = 5.0
+_metrics_snapshot: Tuple[float, str] = (float('-inf'), "")
+
+# Serialized constant responses and when they were serialized (monotonic seconds)
+CONSTANT_RESPONSE_TTL = 1.0
+_constant_responses: Dict[Any, Tuple[float, bytes]] = {}
+
+# How long polled statistics snapshots are reused, in seconds
+STATS_TTL = 1.0
+
+# Cached /search responses by the (source, page id or issue key) they were
+# built from; startup_event resizes the TTL to the ai_response cache TTL so
+# entries live as long as the responses themselves
+RESOURCE_UPDATED = "notifications/resources/updated"
+CACHED_BY_SOURCE_SIZE = 10000
+_cached_by_source: TTLCache = TTLCache(maxsize=CACHED_BY_SOURCE_SIZE, ttl=7200)
+
+# The page id or issue key an MCP resource URI ends with, e.g.
+# "confluence://page/123456" or "jira://issue/PROJ-123"
+RESOURCE_ID = re.compile(r'[\w-]+$')
+_background_tasks: Set[asyncio.Task] = set()
+
 # Global state
 agent_instance: Optional[AIAgent] = None
 cache_manager: Optional[CacheManager] = None
 
 
+class InFlightQueries:
+    """Share one answer between concurrent /search requests for the same query"""
+    
+    def __init__(self):
+        self._pending: Dict[bytes, asyncio.Task] = {}
+    
+    async def run(self, key: bytes, answer: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Await the in-flight answer for key, starting it if there is none"""
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(answer())
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        
+        # A disconnecting client must not cancel the call for the others waiting on it
+        return await asyncio.shield(task)
+
+
+_in_flight = InFlightQueries()
+
+
+def _cache_key(query: str, search_options: Optional[Dict[str, Any]]) -> bytes:
+    """Build a query cache key that is stable across processes, so workers share cache entries"""
+    # CacheManager hashes keys itself, so the serialized options go in as-is
+    options = orjson.dumps(search_options or {}, default=str, option=orjson.OPT_SORT_KEYS)
+    return b"query:" + query.encode() + b":" + options
+
+
 async def get_auth_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[str]:
     """Extract and validate authentication token"""
     if not credentials:
@@ -119,8 +183,10 @@ async def get_auth_token(credentials: HTTPAuthorizationCredentials = Depends(sec
 
 async def startup_event():
     """Initialize services on startup"""
-    global agent_instance, cache_manager
+    global agent_instance, cache_manager, _cached_by_source
     
+    # Request handlers only enqueue log records from here on
+    logging_manager.start_queue_listener()
     logger.info("Starting AI Agent API server...")
     
     try:
@@ -138,15 +204,18 @@ async def startup_event():
         }
         cache_manager = CacheManager(cache_config)
         await cache_manager.initialize()
+        _cached_by_source = TTLCache(maxsize=CACHED_BY_SOURCE_SIZE, ttl=cache_manager.cache_ttl['ai_response'])
         
         # Initialize agent
         agent_instance = AIAgent(config)
+        _subscribe_to_source_updates()
         
         # Start batch processor
         await batch_processor.start_workers()
         
         # Start performance monitoring
         await performance_monitor.start_monitoring()
+        await metrics_collector.start_flushing()
         
         # Load plugins
         await plugin_manager.load_plugins()
@@ -173,12 +242,15 @@ async def shutdown_event():
         
         await batch_processor.stop_workers()
         await performance_monitor.stop_monitoring()
+        await metrics_collector.stop_flushing()
         await plugin_manager.cleanup_all_plugins()
         
         logger.info("AI Agent API server shutdown complete")
         
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
+    
+    logging_manager.stop_queue_listener()
 
 
 # Register startup/shutdown events
@@ -188,30 +260,28 @@ app.add_event_handler("shutdown", shutdown_event)
 
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
-    """Log all requests and responses"""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        "Request received",
-        method=request.method,
-        url=str(request.url),
-        client_ip=request.client.host if request.client else None
-    )
+    """Log requests, one line per request once it completes"""
+    # Polled endpoints are neither logged nor counted
+    if request.url.path in UNLOGGED_PATHS:
+        return await call_next(request)
+    
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
     # Calculate processing time
-    processing_time = time.time() - start_time
+    processing_time = time.perf_counter() - start_time
     
     # Log response
-    logger.info(
-        "Request completed",
-        method=request.method,
-        url=str(request.url),
-        status_code=response.status_code,
-        processing_time=processing_time
-    )
+    if _should_log_request(request, response.status_code):
+        logger.info(
+            "Request completed",
+            method=request.method,
+            url=str(request.url),
+            client_ip=request.client.host if request.client else None,
+            status_code=response.status_code,
+            processing_time=processing_time
+        )
     
     # Record metrics
     metrics_collector.record_request(
@@ -223,14 +293,47 @@ async def logging_middleware(request: Request, call_next):
     return response
 
 
+def _should_log_request(request: Request, status_code: int) -> bool:
+    """Decide whether a completed request gets a log line
+    
+    A successful request is logged once per repeat window for each method,
+    route and status; errors are always logged. The Prometheus request
+    metrics still count every request.
+    """
+    if status_code >= 400:
+        return True
+    
+    # Key on the route template so path parameters don't defeat deduplication
+    route = request.scope.get("route")
+    key = (request.method, getattr(route, "path", request.url.path), status_code)
+    if key in _recent_requests:
+        return False
+    _recent_requests[key] = True
+    return True
+
+
 @app.get("/", response_model=APIResponse)
 async def root():
     """Root endpoint"""
-    return APIResponse(
+    return _constant_response("root", lambda: APIResponse(
         success=True,
         data={"message": "AI Agent API is running", "version": "2.0.0"},
         message="Welcome to AI Agent API"
-    )
+    ))
+
+
+def _constant_response(key: Any, build: Callable[[], APIResponse]) -> Response:
+    """Serve a response whose content only changes with key, serialized at most once per TTL
+    
+    Re-serializing once per CONSTANT_RESPONSE_TTL keeps the timestamp current
+    without validating and encoding the model on every poll.
+    """
+    now = time.monotonic()
+    cached = _constant_responses.get(key)
+    if cached is None or now - cached[0] >= CONSTANT_RESPONSE_TTL:
+        cached = (now, build().model_dump_json().encode())
+        _constant_responses[key] = cached
+    return Response(content=cached[1], media_type="application/json")
 
 
 @app.post("/search", response_model=APIResponse)
@@ -239,21 +342,20 @@ async def search_query(request: QueryRequest, token: str = Depends(get_auth_toke
     if not agent_instance:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        # Execute pre-query plugins
-        context = PluginContext(
-            query=request.query,
-            config=request.search_options or {},
-            metadata={"start_time": start_time}
-        )
-        context = await plugin_manager.execute_event_handlers(PluginEvent.PRE_QUERY, context)
+        # Execute pre-query plugins; the context is only built when a plugin will see it
+        context = None
+        if plugin_manager.has_handlers(PluginEvent.PRE_QUERY):
+            context = await plugin_manager.execute_event_handlers(
+                PluginEvent.PRE_QUERY, _query_context(request)
+            )
         
         # Check cache if enabled
+        cache_key = _cache_key(request.query, request.search_options)
         cached_result = None
         if request.use_cache and cache_manager:
-            cache_key = f"query:{request.query}:{hash(str(request.search_options))}"
             cached_result = await cache_manager.get(cache_key, 'ai_response')
         
         if cached_result:
@@ -262,37 +364,20 @@ async def search_query(request: QueryRequest, token: str = Depends(get_auth_toke
             
             response_data = cached_result
             response_data['cached'] = True
-            response_data['processing_time'] = time.time() - start_time
+            response_data['processing_time'] = time.perf_counter() - start_time
         else:
-            # Process query
-            result = await agent_instance.process_query(request.query, request.search_options)
-            
-            # Analyze query
-            analysis = query_processor.analyze_query(request.query)
+            # Identical queries already being answered share that answer
+            response_data = await _in_flight.run(cache_key, lambda: _answer_query(request, cache_key))
+            response_data = {**response_data, 'processing_time': time.perf_counter() - start_time}
             
-            response_data = {
-                'query': request.query,
-                'solution': result.get('solution', ''),
-                'sources': result.get('sources', {}),
-                'processing_time': time.time() - start_time,
-                'cached': False,
-                'analysis': {
-                    'query_type': analysis.query_type.value,
-                    'intent': analysis.intent.value,
-                    'keywords': analysis.keywords,
-                    'technical_terms': analysis.technical_terms,
-                    'confidence_score': analysis.confidence_score
-                }
-            }
-            
-            # Cache result
             if request.use_cache and cache_manager:
-                await cache_manager.set(cache_key, response_data, 'ai_response')
                 metrics_collector.record_cache_miss('ai_response')
         
         # Execute post-query plugins
-        context.results = [response_data]
-        context = await plugin_manager.execute_event_handlers(PluginEvent.POST_QUERY, context)
+        if plugin_manager.has_handlers(PluginEvent.POST_QUERY):
+            context = context or _query_context(request)
+            context.results = [response_data]
+            context = await plugin_manager.execute_event_handlers(PluginEvent.POST_QUERY, context)
         
         return APIResponse(
             success=True,
@@ -305,12 +390,102 @@ async def search_query(request: QueryRequest, token: str = Depends(get_auth_toke
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _query_context(request: QueryRequest) -> PluginContext:
+    """Build the plugin context for a /search request"""
+    # Plugins get a wall-clock start time; durations in this module use perf_counter
+    return PluginContext(
+        query=request.query,
+        config=request.search_options or {},
+        metadata={"start_time": time.time()}
+    )
+
+
+async def _answer_query(request: QueryRequest, cache_key: bytes) -> Dict[str, Any]:
+    """Process and analyze a query, caching the response data"""
+    start_time = time.perf_counter()
+    
+    # Process query
+    result = await agent_instance.process_query(request.query, request.search_options)
+    
+    # Query analysis is CPU-bound NLP; keep it off the event loop
+    response_data = await asyncio.to_thread(_build_response_data, request.query, result, start_time)
+    
+    # Cache result
+    if request.use_cache and cache_manager:
+        await cache_manager.set(cache_key, response_data, 'ai_response', cost=response_data['processing_time'])
+        _index_sources(cache_key, response_data)
+    
+    return response_data
+
+
+def _index_sources(cache_key: bytes, response_data: Dict[str, Any]) -> None:
+    """Remember which cached responses were built from each Confluence page and JIRA issue"""
+    for ref in source_refs(response_data):
+        # Reassigning restarts the entry's TTL, so it outlives its newest response
+        _cached_by_source[ref] = _cached_by_source.get(ref, set()) | {cache_key}
+
+
+def _subscribe_to_source_updates() -> None:
+    """Drop cached responses built from a page or issue when its MCP server reports a change"""
+    # A client serving both sources gets both handlers, as its URIs could name either
+    for source, client in (("confluence", agent_instance.confluence_client), ("jira", agent_instance.jira_client)):
+        if hasattr(client, 'on_notification'):
+            client.on_notification(RESOURCE_UPDATED, lambda params, source=source: _on_source_updated(source, params))
+
+
+def _on_source_updated(source: str, params: Dict[str, Any]) -> None:
+    """Schedule the invalidation of every cached response built from an updated page or issue"""
+    match = RESOURCE_ID.search(str(params.get('uri', '')).rstrip('/'))
+    if not match:
+        return
+    # The agent's semantic cache could otherwise answer the next /search with
+    # the stale response and write it straight back into the response cache
+    if agent_instance:
+        agent_instance.forget_source(source, match.group())
+    cache_keys = _cached_by_source.pop((source, match.group()), None)
+    if cache_keys and cache_manager:
+        task = asyncio.create_task(_invalidate(cache_keys))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+async def _invalidate(cache_keys: Set[bytes]) -> None:
+    """Delete cached /search responses"""
+    for cache_key in cache_keys:
+        await cache_manager.delete(cache_key, 'ai_response')
+    logger.info("Invalidated cached responses for an updated source", count=len(cache_keys))
+
+
+def _build_response_data(query: str, result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+    """Analyze a query and combine the analysis with its result into /search response data"""
+    analysis = query_processor.analyze_query(query)
+    
+    return {
+        'query': query,
+        'solution': result.get('solution', ''),
+        'sources': result.get('sources', {}),
+        'processing_time': time.perf_counter() - start_time,
+        'cached': False,
+        'analysis': {
+            'query_type': analysis.query_type.value,
+            'intent': analysis.intent.value,
+            'keywords': analysis.keywords,
+            'technical_terms': analysis.technical_terms,
+            'confidence_score': analysis.confidence_score
+        }
+    }
+
+
 @app.post("/batch/search", response_model=APIResponse)
 async def batch_search(request: BatchQueryRequest, background_tasks: BackgroundTasks):
     """Submit batch search queries"""
     if not agent_instance:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
+    # A full queue would park this request until workers drain it; push back instead
+    if not batch_processor.can_accept(len(request.queries)):
+        raise HTTPException(status_code=429, detail="Batch queue full, retry with backoff")
+    
     try:
         batch_id = await batch_processor.process_queries_batch(
             queries=request.queries,
@@ -371,6 +546,19 @@ async def get_batch_results(batch_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/batch/{batch_id}/results/stream")
+async def stream_batch_results(batch_id: str):
+    """Stream the finished results of a batch as NDJSON, one task per line"""
+    if not batch_processor.has_batch(batch_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    async def records():
+        async for record in batch_processor.iter_batch_results(batch_id):
+            yield orjson.dumps(record, default=str) + b"\n"
+    
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+
 @app.post("/semantic/search", response_model=APIResponse)
 async def semantic_search_endpoint(request: SemanticSearchRequest):
     """Perform semantic search"""
@@ -438,11 +626,30 @@ async def build_semantic_index(request: IndexBuildRequest, background_tasks: Bac
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Dashboards poll the stats endpoints; each snapshot is reused for STATS_TTL seconds
+@ttl_cache(maxsize=1, ttl=STATS_TTL)
+def _semantic_stats() -> Dict[str, Any]:
+    """Semantic index statistics"""
+    return semantic_search.get_index_stats()
+
+
+@ttl_cache(maxsize=1, ttl=STATS_TTL)
+def _plugin_status() -> Dict[str, Any]:
+    """Status of the loaded plugins"""
+    return plugin_manager.get_plugin_status()
+
+
+@ttl_cache(maxsize=1, ttl=STATS_TTL)
+def _batch_stats() -> Dict[str, Any]:
+    """Batch processor statistics"""
+    return batch_processor.get_system_stats()
+
+
 @app.get("/semantic/stats", response_model=APIResponse)
 async def get_semantic_stats():
     """Get semantic search statistics"""
     try:
-        stats = semantic_search.get_index_stats()
+        stats = _semantic_stats()
         
         return APIResponse(
             success=True,
@@ -459,7 +666,7 @@ async def get_semantic_stats():
 async def list_plugins():
     """List all loaded plugins"""
     try:
-        plugins = plugin_manager.get_plugin_status()
+        plugins = _plugin_status()
         
         return APIResponse(
             success=True,
@@ -487,6 +694,8 @@ async def plugin_action(request: PluginActionRequest):
         else:
             raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
         
+        _plugin_status.cache_clear()
+        
         if success:
             return APIResponse(
                 success=True,
@@ -507,27 +716,30 @@ async def plugin_action(request: PluginActionRequest):
 async def health_check():
     """Health check endpoint"""
     try:
-        health_data = {
-            'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
-            'services': {
-                'agent': agent_instance is not None,
-                'cache': cache_manager is not None,
-                'batch_processor': batch_processor._workers_running,
-                'plugins': len(plugin_manager.plugins)
-            }
+        services = {
+            'agent': agent_instance is not None,
+            'cache': cache_manager is not None,
+            'batch_processor': batch_processor._workers_running,
+            'plugins': len(plugin_manager.plugins)
         }
+        queue_depth = batch_processor.queue_depth()
         
         # Check service health
         if agent_instance:
             # Could add more specific health checks here
             pass
         
-        return APIResponse(
+        # Keyed on the service states, so a cached payload never reports a stale
+        # state; the queue depth may lag by up to the TTL
+        return _constant_response(("health", *services.values()), lambda: APIResponse(
             success=True,
-            data=health_data,
+            data={
+                'status': 'healthy',
+                'timestamp': datetime.utcnow().isoformat(),
+                'services': {**services, 'batch_queue_depth': queue_depth}
+            },
             message="System is healthy"
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -541,12 +753,19 @@ async def health_check():
 @app.get("/metrics")
 async def get_metrics():
     """Get Prometheus metrics"""
+    global _metrics_snapshot
+    
     try:
-        # Update system metrics
-        metrics_collector.update_system_metrics()
-        
-        # Generate Prometheus format
-        metrics_data = metrics_collector.get_metrics()
+        # Scrapers arriving within the TTL share one generated payload; generation
+        # is synchronous, so concurrent scrapes can't both regenerate it
+        generated_at, metrics_data = _metrics_snapshot
+        if time.monotonic() - generated_at >= METRICS_SNAPSHOT_TTL:
+            # Update system metrics
+            metrics_collector.update_system_metrics()
+            
+            # Generate Prometheus format
+            metrics_data = metrics_collector.get_metrics()
+            _metrics_snapshot = (time.monotonic(), metrics_data)
         
         return Response(
             content=metrics_data,
@@ -563,10 +782,10 @@ async def get_system_stats():
     """Get comprehensive system statistics"""
     try:
         stats = {
-            'batch_processor': batch_processor.get_system_stats(),
+            'batch_processor': _batch_stats(),
             'cache': await cache_manager.get_stats() if cache_manager else {},
             'plugins': len(plugin_manager.plugins),
-            'semantic_search': semantic_search.get_index_stats()
+            'semantic_search': _semantic_stats()
         }
         
         return APIResponse(
@@ -580,13 +799,20 @@ async def get_system_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def run_server(host: str = "0.0.0.0", port: int = 8000, debug: bool = False):
-    """Run the FastAPI server"""
+def run_server(host: str = "0.0.0.0", port: int = 8000, debug: bool = False, workers: int = 1):
+    """Run the FastAPI server
+    
+    uvicorn runs on uvloop and httptools when they are installed (the
+    "speedups" extra). Each worker is a separate process with its own agent,
+    cache and batch state, so batch status lookups need sticky routing when
+    workers > 1; reload mode always runs a single worker.
+    """
     uvicorn.run(
         "ai_agent.api.web_api:app",
         host=host,
         port=port,
         reload=debug,
+        workers=1 if debug else workers,
         log_level="info" if not debug else "debug"
     )
 
@@ -598,7 +824,8 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
     
     args = parser.parse_args()
     
-    run_server(host=args.host, port=args.port, debug=args.debug)
\ No newline at end of file
+    run_server(host=args.host, port=args.port, debug=args.debug, workers=args.workers)
\ No newline at end of file
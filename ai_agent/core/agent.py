@@ -7,9 +7,18 @@ and modern Python patterns for better maintainability and IDE support.
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, List, Any, Optional, Union, AsyncContextManager
+import copy
+import heapq
+import io
+import re
+import time
+from statistics import fmean
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Any, Mapping, Optional, Tuple, Union, AsyncContextManager
 from contextlib import asynccontextmanager
-from datetime import datetime
+from contextvars import ContextVar
+from types import MappingProxyType
+
+from cachetools import LRUCache
 
 from .config import Config, load_config
 from .types import (
@@ -17,17 +26,189 @@ from .types import (
     UserContext, ComprehensiveSolution, BaseSearchResult,
     SourceType, ProblemCategory,
     Urgency, Complexity, ConfidenceScore, AIAgentError,
-    SearchError, ConfigProtocol, AIClientProtocol, MCPClientProtocol
+    SearchError, ValidationError, ConfigProtocol, AIClientProtocol, MCPClientProtocol
 )
-from .ai_client import CustomAIClient
+from .ai_client import AI_ERROR_PREFIX, CustomAIClient
 from ..mcp import ConfluenceMCPClient, JiraMCPClient
 from .code_reader import CodeRepositoryReader
 from .query_processor import NLPProcessor, QueryType, QueryIntent
 from ..infrastructure.semantic_search import enhance_search_results
+from ..infrastructure.semantic_cache import SemanticCache
 from ..infrastructure.advanced_ranking import AdvancedRankingEngine
 import structlog
 
 
+# Default cap on concurrent backend requests issued for a single query
+DEFAULT_MAX_CONCURRENCY = 32
+
+# Accepted length of a query, after stripping surrounding whitespace
+MIN_QUERY_LENGTH = 3
+MAX_QUERY_LENGTH = 1000
+
+# Search options callers may pass to process_query
+VALID_SEARCH_OPTIONS = frozenset((
+    'search_confluence', 'search_jira', 'search_code',
+    'max_results', 'file_types', 'confluence_spaces',
+    'jira_projects', 'jira_key_prefixes', 'max_concurrency',
+    'early_stop_threshold'
+))
+
+# Default number of queries process_queries_batch runs at once
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Intents of a plain documentation lookup, which the top-ranked result can
+# answer without AI synthesis
+DIRECT_ANSWER_INTENTS = frozenset((QueryIntent.SEARCH, QueryIntent.EXPLAIN))
+
+# Relevance score from which a source result counts towards early_stop_threshold
+HIGH_RELEVANCE_SCORE = 0.5
+
+# Number of recent query analyses kept per agent
+ANALYSIS_CACHE_SIZE = 4096
+
+# Size, in characters, past which solution context lines are dropped
+SOLUTION_CONTEXT_BUDGET = 6000
+
+# Sources whose relevance scores feed the confidence score, with the share of
+# it each contributes when it has results: 0.4/0.3/0.3 of the 0.75 above the
+# base score, documentation counting most
+SOURCE_CONFIDENCE_WEIGHTS: Mapping[str, float] = MappingProxyType({
+    "confluence": 0.3,
+    "jira": 0.225,
+    "code": 0.225,
+})
+
+# Start of the solution text of a failed synthesis; responses containing it,
+# or the AI client's error text, are not reused by the semantic cache
+SOLUTION_ERROR_PREFIX = "Error generating solution"
+FAILED_SOLUTION_MARKERS = (AI_ERROR_PREFIX, SOLUTION_ERROR_PREFIX)
+
+# Problem categories with the keywords that score them
+PROBLEM_CATEGORIES: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    "authentication": frozenset(("auth", "login", "password", "token", "oauth", "sso", "authentication", "unauthorized", "401", "403")),
+    "performance": frozenset(("slow", "performance", "timeout", "latency", "memory", "cpu", "optimization", "bottleneck")),
+    "error_debugging": frozenset(("error", "exception", "bug", "crash", "failure", "debug", "stack trace", "500", "404")),
+    "deployment": frozenset(("deploy", "deployment", "build", "ci/cd", "pipeline", "docker", "kubernetes", "infrastructure")),
+    "database": frozenset(("database", "sql", "query", "connection", "migration", "schema", "db", "mysql", "postgres")),
+    "api_integration": frozenset(("api", "rest", "graphql", "endpoint", "integration", "webhook", "microservice")),
+    "configuration": frozenset(("config", "configuration", "settings", "environment", "properties", "yaml", "json")),
+    "security": frozenset(("security", "vulnerability", "encryption", "ssl", "https", "certificate", "privacy")),
+    "testing": frozenset(("test", "testing", "unit test", "integration test", "qa", "automation", "coverage")),
+    "documentation": frozenset(("document", "documentation", "guide", "tutorial", "how to", "instructions"))
+})
+
+HIGH_URGENCY_TERMS = frozenset(("critical", "urgent", "emergency", "down", "production", "outage", "blocking", "broken"))
+MEDIUM_URGENCY_TERMS = frozenset(("issue", "problem", "error", "bug", "failing"))
+
+# Checked in order; the first level with a matching indicator wins
+COMPLEXITY_INDICATORS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    "high": frozenset(("architecture", "scalability", "distributed", "microservices", "performance", "optimization")),
+    "medium": frozenset(("integration", "configuration", "deployment", "testing", "debugging")),
+    "low": frozenset(("how to", "tutorial", "example", "documentation"))
+})
+
+# Search settings each problem category overrides in the default strategy
+CATEGORY_STRATEGIES: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "documentation": {"search_confluence": True, "search_jira": False, "search_code": False, "max_results": 15},
+    "error_debugging": {"search_jira": True, "search_code": True, "max_results": 20},
+    "performance": {"search_code": True, "search_jira": True, "max_results": 15},
+    "authentication": {"search_confluence": True, "search_code": True, "max_results": 12},
+    "deployment": {"search_confluence": True, "search_jira": True, "max_results": 12},
+    "api_integration": {"search_confluence": True, "search_code": True, "max_results": 15}
+})
+
+# Terms appended to the enhanced query for each problem category
+CATEGORY_ENHANCEMENTS: Mapping[str, str] = MappingProxyType({
+    "authentication": "login oauth token auth security",
+    "performance": "performance optimization slow latency",
+    "error_debugging": "error exception debug troubleshooting",
+    "deployment": "deployment build release configuration",
+    "database": "database query sql connection migration",
+    "api_integration": "api rest endpoint integration service"
+})
+
+# Every keyword the tables above match on, once each, so a query is scanned
+# for a keyword shared by several tables only once
+ALL_KEYWORDS: Tuple[str, ...] = tuple(dict.fromkeys(
+    keyword
+    for table in (*PROBLEM_CATEGORIES.values(), HIGH_URGENCY_TERMS, MEDIUM_URGENCY_TERMS, *COMPLEXITY_INDICATORS.values())
+    for keyword in table
+))
+
+# Common technical term patterns
+TECHNICAL_TERM_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b[A-Z][a-z]*(?:[A-Z][a-z]*)+\b',  # CamelCase
+    r'\b[a-z]+(?:_[a-z]+)+\b',          # snake_case
+    r'\b[a-z]+-[a-z]+(?:-[a-z]+)*\b',   # kebab-case
+    r'\b\w+\.\w+(?:\.\w+)*\b',          # package.names
+    r'\b[A-Z]{2,}\b',                   # Acronyms
+    r'\b\d+\.\d+(?:\.\d+)*\b'          # Version numbers
+))
+
+# Header lines of a solution response: any line containing one of these
+# markers starts the section its group is named after
+SOLUTION_SECTION_HEADER = re.compile(
+    r'^.*?(?:(?P<solution>SOLUTION SUMMARY|SOLUTION:)'
+    r'|(?P<steps>IMPLEMENTATION STEPS|STEPS:)'
+    r'|(?P<risks>POTENTIAL RISKS|RISKS:)'
+    r'|(?P<related_issues>RELATED ISSUES|RELATED:)).*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Line prefixes that start a list item in a solution section; bullets are
+# stripped from the item, numbers are kept
+BULLET_PREFIXES = ('- ', '* ')
+LIST_ITEM_PREFIXES = BULLET_PREFIXES + ('1. ', '2. ', '3. ')
+
+# Concurrency slots for the query being processed; set by
+# _collect_comprehensive_data and inherited by the source tasks it spawns
+_backend_slots: ContextVar[Optional[asyncio.Semaphore]] = ContextVar('backend_slots', default=None)
+
+
+def _matched_keywords(query_lower: str) -> FrozenSet[str]:
+    """Keywords from the classification tables that occur in a lowercased query"""
+    return frozenset(keyword for keyword in ALL_KEYWORDS if keyword in query_lower)
+
+
+def _mean(scores: List[float]) -> float:
+    """Mean of a list of scores, 0.0 when empty"""
+    return fmean(scores) if scores else 0.0
+
+
+def _weighted_mean(scores: List[float], weights: List[float]) -> float:
+    """Mean of scores weighted by how much each result is trusted, plain mean if none is"""
+    total = sum(weights)
+    if total <= 0:
+        return _mean(scores)
+    return sum(weight * score for weight, score in zip(weights, scores)) / total
+
+
+def _decisiveness(scores: List[float]) -> float:
+    """How far a source's best score stands above its runner-up, from 0 (tied) to 1"""
+    if len(scores) < 2:
+        return 1.0
+    best, second = heapq.nlargest(2, scores)
+    if best <= 0:
+        return 0.0
+    return 1.0 - (second / best) ** 4
+
+
+def _reusable(response: Dict[str, Any]) -> bool:
+    """Whether a response came from a successful synthesis over some results, so similar queries may reuse it"""
+    solution = response.get("solution") or {}
+    text = str(solution.get("solution", ""))
+    return (
+        solution.get("confidence", 0.0) > 0
+        and not any(marker in text for marker in FAILED_SOLUTION_MARKERS)
+        and response.get("metadata", {}).get("total_results", 0) > 0
+    )
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string, to the second"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
 class AIAgent:
     """
     Main AI agent that coordinates between Confluence, JIRA, and code repository 
@@ -48,6 +229,22 @@ class AIAgent:
         """
         self.config: Config = config or load_config()
         self._initialized: bool = False
+        # Serialises initialize() so concurrent callers share one connection attempt
+        self._init_lock: asyncio.Lock = asyncio.Lock()
+        # Caps backend search requests across every query this agent runs
+        self._search_sem: asyncio.Semaphore = asyncio.Semaphore(
+            getattr(self.config, 'max_concurrent_searches', 4)
+        )
+        # Responses of recent similar queries, when enabled
+        self._semantic_cache: Optional[SemanticCache] = None
+        if getattr(self.config, 'enable_semantic_cache', False):
+            self._semantic_cache = SemanticCache(
+                max_size=getattr(self.config, 'semantic_cache_size', 1000),
+                ttl=getattr(self.config, 'semantic_cache_ttl', 300),
+                threshold=getattr(self.config, 'semantic_cache_threshold', 0.9)
+            )
+        # Problem analyses of recent queries, keyed by whitespace-normalized query
+        self._analysis_cache: LRUCache = LRUCache(maxsize=ANALYSIS_CACHE_SIZE)
         
         # Initialize logger
         self.logger = structlog.get_logger(__name__)
@@ -98,31 +295,38 @@ class AIAgent:
         Raises:
             MCPConnectionError: If client connections fail
         """
-        if self._initialized:
-            return
+        async with self._init_lock:
+            if self._initialized:
+                return
             
-        try:
-            self.logger.info("Initializing AI Agent connections")
-            
-            # Initialize clients that require async setup
-            if self.config.use_integrated_atlassian:
-                # For integrated mode, initialize the shared client once
-                if hasattr(self.confluence_client, 'initialize'):
-                    await self.confluence_client.initialize()
-                    self.logger.info("Integrated Atlassian client initialized")
-            elif not self.config.disable_external_mcp:
-                # Only connect to external MCP servers if not disabled
-                if hasattr(self.confluence_client, 'connect'):
-                    await self.confluence_client.connect()
-                if hasattr(self.jira_client, 'connect'):
-                    await self.jira_client.connect()
-                    
-            self._initialized = True
-            self.logger.info("AI Agent initialization completed")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize AI Agent: {e}")
-            raise AIAgentError(f"Initialization failed: {e}") from e
+            try:
+                self.logger.info("Initializing AI Agent connections")
+                
+                # Initialize clients that require async setup
+                if self.config.use_integrated_atlassian:
+                    # For integrated mode, initialize the shared client once
+                    if hasattr(self.confluence_client, 'initialize'):
+                        await self.confluence_client.initialize()
+                        self.logger.info("Integrated Atlassian client initialized")
+                elif not self.config.disable_external_mcp:
+                    # Only connect to external MCP servers if not disabled; the
+                    # servers are independent, so both handshakes run at once and
+                    # both finish before a failure of either is reported
+                    results = await asyncio.gather(*(
+                        client.connect()
+                        for client in (self.confluence_client, self.jira_client)
+                        if hasattr(client, 'connect')
+                    ), return_exceptions=True)
+                    for result in results:
+                        if isinstance(result, Exception):
+                            raise result
+                
+                self._initialized = True
+                self.logger.info("AI Agent initialization completed")
+                
+            except Exception as e:
+                self.logger.error(f"Failed to initialize AI Agent: {e}")
+                raise AIAgentError(f"Initialization failed: {e}") from e
     
     async def process_query(
         self, 
@@ -143,53 +347,34 @@ class AIAgent:
             SearchError: If query processing fails
             ValidationError: If input validation fails
         """
+        started = time.perf_counter()
+        
         # Input validation
         self._validate_query_input(query, search_options)
         
+        if self._semantic_cache is not None:
+            cached = self._semantic_cache.get(query, search_options)
+            if cached is not None:
+                self.logger.info("Reusing response of a similar query", query=query)
+                cached["metadata"]["timestamp"] = _utc_timestamp()
+                cached["metadata"]["processing_time_ms"] = (time.perf_counter() - started) * 1000.0
+                return cached
+        
         if not self._initialized:
             await self.initialize()
         
         self.logger.info("Processing query", query=query, has_options=search_options is not None)
         
         try:
-            # Analyze the problem using NLP
-            problem_analysis = await self._analyze_problem(query)
+            problem_analysis, search_strategy, ranked_data = await self._retrieve_and_rank(query, search_options)
             
-            # Determine optimal search strategy based on problem type
-            search_strategy = self._determine_search_strategy(problem_analysis)
+            # A documentation lookup whose top result is a near-certain match is
+            # answered with that result; otherwise synthesize a solution
+            solution_synthesis = self._direct_solution(problem_analysis, ranked_data)
+            if solution_synthesis is None:
+                solution_synthesis = await self._synthesize_solution(query, problem_analysis, ranked_data)
             
-            # Override with user options if provided
-            if search_options:
-                search_strategy = self._merge_search_options(search_strategy, search_options)
-            
-            # Collect data from all relevant sources
-            all_data = await self._collect_comprehensive_data(query, search_strategy, problem_analysis)
-            
-            # Apply advanced ranking to all results
-            user_context = self._build_user_context(search_strategy, problem_analysis)
-            ranked_data = self.ranking_engine.rank_all_results(all_data, query, user_context)
-            
-            # Synthesize comprehensive solution using ranked data
-            solution_synthesis = await self._synthesize_solution(query, problem_analysis, ranked_data)
-            
-            # Build comprehensive response
-            response: SearchResponse = {
-                "query": query,
-                "problem_analysis": problem_analysis,
-                "solution": solution_synthesis,
-                "sources": ranked_data["sources"],
-                "search_strategy": search_strategy,
-                "ranking_insights": ranked_data.get("ranking_insights", {}),
-                "cross_correlations": ranked_data.get("cross_correlations", []),
-                "metadata": {
-                    "processing_time": datetime.now().isoformat(),
-                    "agent_version": "2.0.0",
-                    "total_results": sum(
-                        source.get("count", 0) 
-                        for source in ranked_data["sources"].values()
-                    )
-                }
-            }
+            response = self._build_response(query, problem_analysis, search_strategy, ranked_data, solution_synthesis, started)
             
             self.logger.info(
                 "Query processing completed successfully", 
@@ -197,12 +382,182 @@ class AIAgent:
                 total_results=response["metadata"]["total_results"]
             )
             
+            if self._semantic_cache is not None and _reusable(response):
+                self._semantic_cache.set(query, search_options, response)
+            
             return response
             
         except Exception as e:
             self.logger.error("Query processing failed", error=str(e), query=query)
             raise SearchError(f"Failed to process query: {e}") from e
     
+    async def process_query_streaming(
+        self, 
+        query: QueryString, 
+        search_options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query like process_query, streaming the solution as it is generated.
+        
+        Args:
+            query: User query string to process
+            search_options: Optional search configuration overrides
+            
+        Yields:
+            {"type": "sources", "result": ...} once sources are ranked (the
+            response so far, with no solution yet), then {"type": "token",
+            "text": ...} for each chunk of solution text, and finally
+            {"type": "final", "result": ...} with the complete response
+            
+        Raises:
+            SearchError: If query processing fails
+            ValidationError: If input validation fails
+        """
+        started = time.perf_counter()
+        self._validate_query_input(query, search_options)
+        
+        if not self._initialized:
+            await self.initialize()
+        
+        self.logger.info("Processing streaming query", query=query, has_options=search_options is not None)
+        
+        try:
+            problem_analysis, search_strategy, ranked_data = await self._retrieve_and_rank(query, search_options)
+            yield {
+                "type": "sources",
+                "result": self._build_response(query, problem_analysis, search_strategy, ranked_data, None, started)
+            }
+            
+            solution_synthesis = self._direct_solution(problem_analysis, ranked_data)
+            if solution_synthesis is None:
+                chunks = []
+                messages = self._build_solution_messages(query, problem_analysis, ranked_data)
+                async for chunk in self.ai_client.stream_response(messages, max_tokens=2000):
+                    chunks.append(chunk)
+                    yield {"type": "token", "text": chunk}
+                
+                try:
+                    solution_synthesis = self._complete_solution("".join(chunks), problem_analysis, ranked_data)
+                except Exception as e:
+                    self.logger.error(f"Error synthesizing solution: {e}")
+                    solution_synthesis = self._failed_solution(e)
+            
+            response = self._build_response(query, problem_analysis, search_strategy, ranked_data, solution_synthesis, started)
+            
+            self.logger.info(
+                "Streaming query completed successfully", 
+                confidence=solution_synthesis.get("confidence", 0.0),
+                total_results=response["metadata"]["total_results"]
+            )
+            
+            yield {"type": "final", "result": response}
+            
+        except Exception as e:
+            self.logger.error("Query processing failed", error=str(e), query=query)
+            raise SearchError(f"Failed to process query: {e}") from e
+    
+    async def _retrieve_and_rank(
+        self, 
+        query: QueryString, 
+        search_options: Optional[Dict[str, Any]]
+    ) -> Tuple[ProblemAnalysis, Dict[str, Any], Dict[str, Any]]:
+        """Analyze the query, then search and rank every relevant source"""
+        
+        # Analyze the problem using NLP
+        problem_analysis = await self._analyze_problem(query)
+        
+        # Determine optimal search strategy based on problem type
+        search_strategy = self._determine_search_strategy(problem_analysis)
+        
+        # Override with user options if provided
+        if search_options:
+            search_strategy = self._merge_search_options(search_strategy, search_options)
+        
+        # Collect data from all relevant sources
+        all_data = await self._collect_comprehensive_data(query, search_strategy, problem_analysis)
+        
+        # Apply advanced ranking to all results
+        user_context = self._build_user_context(search_strategy, problem_analysis)
+        ranked_data = self.ranking_engine.rank_all_results(all_data, query, user_context)
+        
+        return problem_analysis, search_strategy, ranked_data
+    
+    def _build_response(
+        self, 
+        query: QueryString, 
+        problem_analysis: ProblemAnalysis, 
+        search_strategy: Dict[str, Any], 
+        ranked_data: Dict[str, Any], 
+        solution_synthesis: Optional[Dict[str, Any]],
+        started: float
+    ) -> SearchResponse:
+        """Assemble the response returned to callers; started is the query's perf_counter() start"""
+        return {
+            "query": query,
+            "problem_analysis": problem_analysis,
+            "solution": solution_synthesis,
+            "sources": ranked_data["sources"],
+            "search_strategy": search_strategy,
+            "ranking_insights": ranked_data.get("ranking_insights", {}),
+            "cross_correlations": ranked_data.get("cross_correlations", []),
+            "metadata": {
+                "timestamp": _utc_timestamp(),
+                "processing_time_ms": (time.perf_counter() - started) * 1000.0,
+                "agent_version": "2.0.0",
+                "total_results": ranked_data.get("total", 0)
+            }
+        }
+    
+    def forget_source(self, source: str, source_id: str) -> None:
+        """Stop reusing responses built from a Confluence page or JIRA issue that has changed"""
+        if self._semantic_cache is not None:
+            dropped = self._semantic_cache.invalidate_source(source, source_id)
+            if dropped:
+                self.logger.info("Dropped reused responses of an updated source", source=source, source_id=source_id, count=dropped)
+    
+    async def process_queries_batch(
+        self,
+        queries: List[QueryString],
+        search_options: Optional[Dict[str, Any]] = None,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> AsyncIterator[Tuple[QueryString, Union[SearchResponse, Exception]]]:
+        """
+        Process several queries concurrently, yielding each result as it completes.
+        
+        Args:
+            queries: Queries to process
+            search_options: Search configuration applied to every query
+            concurrency: Maximum number of queries in flight at once
+            
+        Yields:
+            (query, response) pairs in completion order; a query that fails
+            yields its exception instead of a response
+            
+        Raises:
+            ValidationError: If concurrency is not a positive integer
+        """
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValidationError("concurrency must be a positive integer")
+        
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def run(query: QueryString) -> Tuple[QueryString, Union[SearchResponse, Exception]]:
+            async with slots:
+                try:
+                    return query, await self.process_query(query, search_options)
+                except Exception as e:
+                    return query, e
+        
+        tasks = [asyncio.create_task(run(query)) for query in queries]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer may stop early; don't leave queries running behind it
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def _validate_query_input(
         self, 
         query: QueryString, 
@@ -218,21 +573,18 @@ class AIAgent:
         Raises:
             ValidationError: If validation fails
         """
-        from .types import ValidationError
-        
         # Validate query
         if not query or not isinstance(query, str):
             raise ValidationError("Query must be a non-empty string")
         
-        query_stripped = query.strip()
-        if not query_stripped:
-            raise ValidationError("Query cannot be empty or only whitespace")
-        
-        if len(query_stripped) > 1000:
-            raise ValidationError("Query too long (max 1000 characters)")
-        
-        if len(query_stripped) < 3:
-            raise ValidationError("Query too short (min 3 characters)")
+        # One range check on the common path; the message depends on which bound failed
+        query_length = len(query.strip())
+        if not MIN_QUERY_LENGTH <= query_length <= MAX_QUERY_LENGTH:
+            if not query_length:
+                raise ValidationError("Query cannot be empty or only whitespace")
+            if query_length > MAX_QUERY_LENGTH:
+                raise ValidationError(f"Query too long (max {MAX_QUERY_LENGTH} characters)")
+            raise ValidationError(f"Query too short (min {MIN_QUERY_LENGTH} characters)")
         
         # Validate search options if provided
         if search_options is not None:
@@ -240,14 +592,8 @@ class AIAgent:
                 raise ValidationError("search_options must be a dictionary")
             
             # Validate specific option values
-            valid_option_keys = {
-                'search_confluence', 'search_jira', 'search_code',
-                'max_results', 'file_types', 'confluence_spaces',
-                'jira_projects', 'jira_key_prefixes'
-            }
-            
             for key in search_options.keys():
-                if key not in valid_option_keys:
+                if key not in VALID_SEARCH_OPTIONS:
                     raise ValidationError(f"Unknown search option: {key}")
             
             # Validate max_results if provided
@@ -255,6 +601,18 @@ class AIAgent:
             if max_results is not None:
                 if not isinstance(max_results, int) or max_results < 1 or max_results > 100:
                     raise ValidationError("max_results must be integer between 1 and 100")
+            
+            # Validate max_concurrency if provided
+            max_concurrency = search_options.get('max_concurrency')
+            if max_concurrency is not None:
+                if not isinstance(max_concurrency, int) or max_concurrency < 1 or max_concurrency > 256:
+                    raise ValidationError("max_concurrency must be integer between 1 and 256")
+            
+            # Validate early_stop_threshold if provided
+            early_stop_threshold = search_options.get('early_stop_threshold')
+            if early_stop_threshold is not None:
+                if not isinstance(early_stop_threshold, int) or early_stop_threshold < 1 or early_stop_threshold > 100:
+                    raise ValidationError("early_stop_threshold must be integer between 1 and 100")
     
     def _merge_search_options(
         self, 
@@ -273,9 +631,10 @@ class AIAgent:
         """
         merged = base_strategy.copy()
         
-        # Safe updates with validation
+        # Keys were checked by _validate_query_input; options the base strategy
+        # doesn't define (file_types, jira_key_prefixes, ...) are added as-is
         for key, value in user_options.items():
-            if key in merged:
+            if value is not None or key in merged:
                 merged[key] = value  # type: ignore
         
         return merged
@@ -283,36 +642,49 @@ class AIAgent:
     async def _analyze_problem(self, query: QueryString) -> ProblemAnalysis:
         """Analyze the problem to understand its nature and determine search strategy"""
         
+        # Analysis depends only on the query text, so repeats skip the NLP pass.
+        # Case is kept: entity and technical term extraction depend on it
+        normalized_query = " ".join(query.split())
+        cached = self._analysis_cache.get(normalized_query)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         try:
             # Use NLP processor to analyze query
-            analysis = self.nlp_processor.analyze_query(query)
+            analysis = self.nlp_processor.analyze_query(normalized_query)
+            
+            # Scan the lowercased query for every keyword once; the helpers
+            # below only look up which keywords matched
+            matched = _matched_keywords(normalized_query.lower())
             
             # Determine problem category
-            problem_category = self._categorize_problem(query, analysis)
+            problem_category = self._categorize_problem(matched, analysis)
             
             # Extract key technical terms
-            technical_terms = self._extract_technical_terms(query)
+            technical_terms = self._extract_technical_terms(normalized_query)
             
             # Determine urgency and complexity
-            urgency = self._assess_urgency(query)
-            complexity = self._assess_complexity(query, technical_terms)
+            urgency = self._assess_urgency(matched)
+            complexity = self._assess_complexity(matched, technical_terms)
             
-            return {
-                "query_type": analysis.get("query_type", QueryType.GENERAL),
-                "intent": analysis.get("intent", QueryIntent.INFORMATION),
+            problem_analysis = {
+                "query_type": analysis.query_type,
+                "intent": analysis.intent,
                 "problem_category": problem_category,
                 "technical_terms": technical_terms,
                 "urgency": urgency,
                 "complexity": complexity,
-                "keywords": analysis.get("keywords", []),
-                "entities": analysis.get("entities", [])
+                "keywords": analysis.keywords,
+                "entities": analysis.entities
             }
+            self._analysis_cache[normalized_query] = copy.deepcopy(problem_analysis)
+            return problem_analysis
             
         except Exception as e:
             self.logger.error(f"Error analyzing problem: {e}")
             return {
                 "query_type": QueryType.GENERAL,
-                "intent": QueryIntent.INFORMATION,
+                "intent": QueryIntent.SEARCH,
                 "problem_category": "general",
                 "technical_terms": [],
                 "urgency": "medium",
@@ -321,29 +693,13 @@ class AIAgent:
                 "entities": []
             }
     
-    def _categorize_problem(self, query: str, analysis: Dict[str, Any]) -> str:
-        """Categorize the problem based on content analysis"""
-        
-        query_lower = query.lower()
-        
-        # Define problem categories with keywords
-        categories = {
-            "authentication": ["auth", "login", "password", "token", "oauth", "sso", "authentication", "unauthorized", "401", "403"],
-            "performance": ["slow", "performance", "timeout", "latency", "memory", "cpu", "optimization", "bottleneck"],
-            "error_debugging": ["error", "exception", "bug", "crash", "failure", "debug", "stack trace", "500", "404"],
-            "deployment": ["deploy", "deployment", "build", "ci/cd", "pipeline", "docker", "kubernetes", "infrastructure"],
-            "database": ["database", "sql", "query", "connection", "migration", "schema", "db", "mysql", "postgres"],
-            "api_integration": ["api", "rest", "graphql", "endpoint", "integration", "webhook", "microservice"],
-            "configuration": ["config", "configuration", "settings", "environment", "properties", "yaml", "json"],
-            "security": ["security", "vulnerability", "encryption", "ssl", "https", "certificate", "privacy"],
-            "testing": ["test", "testing", "unit test", "integration test", "qa", "automation", "coverage"],
-            "documentation": ["document", "documentation", "guide", "tutorial", "how to", "instructions"]
-        }
+    def _categorize_problem(self, matched: FrozenSet[str], analysis: Dict[str, Any]) -> str:
+        """Categorize the problem from the keywords its query matched"""
         
         # Score each category
         category_scores = {}
-        for category, keywords in categories.items():
-            score = sum(1 for keyword in keywords if keyword in query_lower)
+        for category, keywords in PROBLEM_CATEGORIES.items():
+            score = len(matched & keywords)
             if score > 0:
                 category_scores[category] = score
         
@@ -356,53 +712,26 @@ class AIAgent:
     def _extract_technical_terms(self, query: str) -> List[str]:
         """Extract technical terms from the query"""
         
-        # Common technical terms patterns
-        technical_patterns = [
-            r'\b[A-Z][a-z]*(?:[A-Z][a-z]*)+\b',  # CamelCase
-            r'\b[a-z]+(?:_[a-z]+)+\b',          # snake_case
-            r'\b[a-z]+-[a-z]+(?:-[a-z]+)*\b',   # kebab-case
-            r'\b\w+\.\w+(?:\.\w+)*\b',          # package.names
-            r'\b[A-Z]{2,}\b',                   # Acronyms
-            r'\b\d+\.\d+(?:\.\d+)*\b'          # Version numbers
-        ]
-        
-        import re
-        technical_terms = []
-        for pattern in technical_patterns:
-            matches = re.findall(pattern, query)
-            technical_terms.extend(matches)
-        
-        return list(set(technical_terms))  # Remove duplicates
+        # Each pattern scans separately: their matches may overlap. Duplicates
+        # are dropped keeping first-seen order, so the result is deterministic
+        return list(dict.fromkeys(match for pattern in TECHNICAL_TERM_PATTERNS for match in pattern.findall(query)))
     
-    def _assess_urgency(self, query: str) -> str:
-        """Assess the urgency of the problem"""
-        
-        query_lower = query.lower()
-        
-        high_urgency = ["critical", "urgent", "emergency", "down", "production", "outage", "blocking", "broken"]
-        medium_urgency = ["issue", "problem", "error", "bug", "failing"]
+    def _assess_urgency(self, matched: FrozenSet[str]) -> str:
+        """Assess the urgency of the problem from the keywords its query matched"""
         
-        if any(word in query_lower for word in high_urgency):
+        if not matched.isdisjoint(HIGH_URGENCY_TERMS):
             return "high"
-        elif any(word in query_lower for word in medium_urgency):
+        elif not matched.isdisjoint(MEDIUM_URGENCY_TERMS):
             return "medium"
         else:
             return "low"
     
-    def _assess_complexity(self, query: str, technical_terms: List[str]) -> str:
-        """Assess the complexity of the problem"""
-        
-        complexity_indicators = {
-            "high": ["architecture", "scalability", "distributed", "microservices", "performance", "optimization"],
-            "medium": ["integration", "configuration", "deployment", "testing", "debugging"],
-            "low": ["how to", "tutorial", "example", "documentation"]
-        }
-        
-        query_lower = query.lower()
+    def _assess_complexity(self, matched: FrozenSet[str], technical_terms: List[str]) -> str:
+        """Assess the complexity of the problem from the keywords its query matched"""
         
         # Check complexity indicators
-        for level, indicators in complexity_indicators.items():
-            if any(indicator in query_lower for indicator in indicators):
+        for level, indicators in COMPLEXITY_INDICATORS.items():
+            if not matched.isdisjoint(indicators):
                 return level
         
         # Use technical terms count as fallback
@@ -429,17 +758,8 @@ class AIAgent:
         }
         
         # Adjust based on problem category
-        category_strategies = {
-            "documentation": {"search_confluence": True, "search_jira": False, "search_code": False, "max_results": 15},
-            "error_debugging": {"search_jira": True, "search_code": True, "max_results": 20},
-            "performance": {"search_code": True, "search_jira": True, "max_results": 15},
-            "authentication": {"search_confluence": True, "search_code": True, "max_results": 12},
-            "deployment": {"search_confluence": True, "search_jira": True, "max_results": 12},
-            "api_integration": {"search_confluence": True, "search_code": True, "max_results": 15}
-        }
-        
-        if problem_category in category_strategies:
-            strategy.update(category_strategies[problem_category])
+        if problem_category in CATEGORY_STRATEGIES:
+            strategy.update(CATEGORY_STRATEGIES[problem_category])
         
         # Adjust based on urgency
         if urgency == "high":
@@ -461,43 +781,109 @@ class AIAgent:
         # Build enhanced search queries
         enhanced_queries = self._build_enhanced_queries(query, problem_analysis)
         
+        # Bound the backend requests this query may have in flight at once;
+        # the source tasks created below inherit the semaphore from the context
+        slots_token = _backend_slots.set(
+            asyncio.Semaphore(search_strategy.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)
+        )
+        
+        # Each source is scheduled as its own task so every backend request is
+        # in flight before we await any of them; a per-source time budget keeps
+        # one slow backend from stalling the others.
         if search_strategy.get("search_confluence", True):
-            tasks.append(self._search_confluence_enhanced(enhanced_queries, search_strategy.get("max_results", 10)))
+            tasks.append(self._start_source_search(
+                self._search_confluence_enhanced(enhanced_queries, search_strategy.get("max_results", 10)),
+                getattr(self.config, 'confluence_timeout', 30.0)
+            ))
             task_sources.append("confluence")
         
         if search_strategy.get("search_jira", True):
-            tasks.append(self._search_jira_enhanced(enhanced_queries, search_strategy.get("max_results", 10), problem_analysis, search_strategy))
+            tasks.append(self._start_source_search(
+                self._search_jira_enhanced(enhanced_queries, search_strategy.get("max_results", 10), problem_analysis, search_strategy),
+                getattr(self.config, 'jira_timeout', 30.0)
+            ))
             task_sources.append("jira")
         
         if search_strategy.get("search_code", True):
-            tasks.append(self._search_code_enhanced(enhanced_queries, search_strategy.get("file_types"), problem_analysis))
+            tasks.append(self._start_source_search(
+                self._search_code_enhanced(enhanced_queries, search_strategy.get("file_types"), problem_analysis)
+            ))
             task_sources.append("code")
         
+        # Tasks captured the context when created, so the caller's context can
+        # be restored before waiting on them
+        _backend_slots.reset(slots_token)
+        
+        # With early_stop_threshold set, sources still searching are cancelled
+        # once that many highly relevant results have come in from the others
+        early_stop_threshold = search_strategy.get("early_stop_threshold")
+        pending = dict(zip(tasks, task_sources))
+        
         try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            processed_data = {"sources": {}}
-            
-            for i, result in enumerate(results):
-                source = task_sources[i]
-                if isinstance(result, Exception):
-                    self.logger.error(f"Error searching {source}: {result}")
-                    processed_data["sources"][source] = {"count": 0, "data": [], "error": str(result)}
-                else:
-                    # Enhance results with semantic analysis
-                    enhanced_results = enhance_search_results(result, query)
-                    processed_data["sources"][source] = {
-                        "count": len(enhanced_results),
-                        "data": enhanced_results,
-                        "relevance_scores": [r.get("relevance_score", 0) for r in enhanced_results]
-                    }
-            
-            return processed_data
+            collected = {}
+            total = 0
+            relevant = 0
+            
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = pending.pop(task)
+                    error = task.exception()
+                    if isinstance(error, asyncio.TimeoutError):
+                        self.logger.error(f"Search timed out for {source}")
+                        collected[source] = {"count": 0, "data": [], "error": f"{source} search timed out"}
+                    elif error is not None:
+                        self.logger.error(f"Error searching {source}: {error}")
+                        collected[source] = {"count": 0, "data": [], "error": str(error)}
+                    else:
+                        # Enhance results with semantic analysis
+                        enhanced_results = await enhance_search_results(task.result(), query)
+                        collected[source] = {
+                            "count": len(enhanced_results),
+                            "data": enhanced_results,
+                            "relevance_scores": [r.get("relevance_score", 0) for r in enhanced_results],
+                            # Share of the query's terms each result contains
+                            "query_coverage": [min(r.get("keyword_score", 0), 1.0) for r in enhanced_results]
+                        }
+                        total += len(enhanced_results)
+                        relevant += sum(1 for r in enhanced_results if r.get("relevance_score", 0) >= HIGH_RELEVANCE_SCORE)
+                
+                if early_stop_threshold and pending and relevant >= early_stop_threshold:
+                    self.logger.info("Enough relevant results, cancelling slower sources", cancelled=list(pending.values()))
+                    for task, source in pending.items():
+                        task.cancel()
+                        collected[source] = {"count": 0, "data": [], "skipped": "enough relevant results from other sources"}
+                    break
+            
+            # Report sources in the order they were searched, not completion order
+            return {"sources": {source: collected[source] for source in task_sources}, "total": total}
             
         except Exception as e:
             self.logger.error(f"Error collecting data: {e}")
-            return {"sources": {"confluence": {"count": 0, "data": []}, "jira": {"count": 0, "data": []}, "code": {"count": 0, "data": []}}}
+            return {"sources": {"confluence": {"count": 0, "data": []}, "jira": {"count": 0, "data": []}, "code": {"count": 0, "data": []}}, "total": 0}
+        finally:
+            # Don't leave searches running if we stopped early or were cancelled
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _limited(self, coro):
+        """Await a backend request while holding one of the current query's slots and an agent-wide slot"""
+        slots = _backend_slots.get()
+        if slots is None:
+            async with self._search_sem:
+                return await coro
+        # Take the query's own slot first so a query waiting on its own cap
+        # doesn't hold agent-wide slots other queries could use
+        async with slots, self._search_sem:
+            return await coro
+    
+    def _start_source_search(self, coro, timeout: Optional[float] = None) -> asyncio.Task:
+        """Schedule a per-source search immediately, bounded by an optional time budget"""
+        if timeout:
+            coro = asyncio.wait_for(coro, timeout=timeout)
+        return asyncio.create_task(coro)
     
     def _build_enhanced_queries(self, original_query: str, problem_analysis: Dict[str, Any]) -> Dict[str, str]:
         """Build enhanced queries for different sources based on problem analysis"""
@@ -515,17 +901,8 @@ class AIAgent:
             enhanced_query += " " + " ".join(technical_terms)
         
         # Category-specific enhancements
-        category_enhancements = {
-            "authentication": "login oauth token auth security",
-            "performance": "performance optimization slow latency",
-            "error_debugging": "error exception debug troubleshooting",
-            "deployment": "deployment build release configuration",
-            "database": "database query sql connection migration",
-            "api_integration": "api rest endpoint integration service"
-        }
-        
-        if problem_category in category_enhancements:
-            enhanced_query += " " + category_enhancements[problem_category]
+        if problem_category in CATEGORY_ENHANCEMENTS:
+            enhanced_query += " " + CATEGORY_ENHANCEMENTS[problem_category]
         
         return {
             "original": original_query,
@@ -534,77 +911,135 @@ class AIAgent:
             "keywords": " ".join(keywords) if keywords else original_query
         }
     
+    def _direct_solution(self, problem_analysis: Dict[str, Any], ranked_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Solution taken straight from the top-ranked result, or None if the AI should synthesize one"""
+        
+        if not getattr(self.config, 'enable_direct_answers', True):
+            return None
+        if (problem_analysis.get("problem_category") != "documentation"
+                or problem_analysis.get("intent") not in DIRECT_ANSWER_INTENTS):
+            return None
+        
+        # Each source's results are sorted by ranking score, best first
+        top = max(
+            (source["data"][0] for source in ranked_data["sources"].values() if source.get("data")),
+            key=lambda result: result.get("ranking_score", 0.0),
+            default=None
+        )
+        if top is None or top.get("ranking_score", 0.0) < getattr(self.config, 'direct_answer_threshold', 0.9):
+            return None
+        
+        title = top.get("title") or top.get("key") or top.get("file_path") or "Top result"
+        text = top.get("excerpt") or top.get("summary") or top.get("content_preview") or ""
+        solution = f"{title}: {text}" if text else title
+        if top.get("url"):
+            solution += f"\n\nSee: {top['url']}"
+        
+        self.logger.info("Answering from top-ranked result", title=title, score=top["ranking_score"])
+        return {
+            "solution": solution,
+            "steps": [],
+            "risks": [],
+            "related_issues": [],
+            "confidence": top["ranking_score"],
+            "direct_answer": True
+        }
+    
     async def _synthesize_solution(self, query: str, problem_analysis: Dict[str, Any], all_data: Dict[str, Any]) -> Dict[str, Any]:
         """Synthesize comprehensive solution from all collected data"""
         
         try:
-            # Prepare context for AI analysis
-            context_data = self._prepare_solution_context(query, problem_analysis, all_data)
-            
             # Generate comprehensive solution using AI
-            solution_prompt = self._build_solution_prompt(query, problem_analysis, context_data)
-            
-            solution_response = await self.ai_client.generate_response([
-                {"role": "system", "content": "You are an expert software engineer and problem solver. Provide comprehensive, actionable solutions based on the context provided."},
-                {"role": "user", "content": solution_prompt}
-            ], max_tokens=2000)
-            
-            # Parse structured response
-            solution_parts = self._parse_solution_response(solution_response)
+            solution_response = await self.ai_client.generate_response(
+                self._build_solution_messages(query, problem_analysis, all_data), max_tokens=2000
+            )
             
-            # Calculate confidence score
-            confidence = self._calculate_confidence_score(all_data, problem_analysis)
-            
-            return {
-                "solution": solution_parts.get("solution", solution_response),
-                "steps": solution_parts.get("steps", []),
-                "risks": solution_parts.get("risks", []),
-                "related_issues": solution_parts.get("related_issues", []),
-                "confidence": confidence
-            }
+            return self._complete_solution(solution_response, problem_analysis, all_data)
             
         except Exception as e:
             self.logger.error(f"Error synthesizing solution: {e}")
-            return {
-                "solution": f"Error generating solution: {str(e)}",
-                "steps": [],
-                "risks": ["Solution generation failed"],
-                "related_issues": [],
-                "confidence": 0.0
-            }
+            return self._failed_solution(e)
+    
+    def _build_solution_messages(self, query: str, problem_analysis: Dict[str, Any], all_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build the chat messages asking the AI for a solution"""
+        
+        # Prepare context for AI analysis
+        context_data = self._prepare_solution_context(query, problem_analysis, all_data)
+        solution_prompt = self._build_solution_prompt(query, problem_analysis, context_data)
+        
+        return [
+            {"role": "system", "content": "You are an expert software engineer and problem solver. Provide comprehensive, actionable solutions based on the context provided."},
+            {"role": "user", "content": solution_prompt}
+        ]
+    
+    def _complete_solution(self, solution_response: str, problem_analysis: Dict[str, Any], all_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the AI's solution text into the structured solution"""
+        
+        # Parse structured response
+        solution_parts = self._parse_solution_response(solution_response)
+        
+        # Calculate confidence score
+        confidence = self._calculate_confidence_score(all_data, problem_analysis)
+        
+        return {
+            "solution": solution_parts.get("solution", solution_response),
+            "steps": solution_parts.get("steps", []),
+            "risks": solution_parts.get("risks", []),
+            "related_issues": solution_parts.get("related_issues", []),
+            "confidence": confidence
+        }
+    
+    def _failed_solution(self, error: Exception) -> Dict[str, Any]:
+        """Structured solution reported when synthesis fails"""
+        return {
+            "solution": f"{SOLUTION_ERROR_PREFIX}: {str(error)}",
+            "steps": [],
+            "risks": ["Solution generation failed"],
+            "related_issues": [],
+            "confidence": 0.0
+        }
     
     def _prepare_solution_context(self, query: str, problem_analysis: Dict[str, Any], all_data: Dict[str, Any]) -> str:
         """Prepare comprehensive context for solution generation"""
         
-        context_parts = [f"Problem Query: {query}"]
-        context_parts.append(f"Problem Category: {problem_analysis.get('problem_category', 'general')}")
-        context_parts.append(f"Urgency: {problem_analysis.get('urgency', 'medium')}")
-        context_parts.append(f"Complexity: {problem_analysis.get('complexity', 'medium')}")
+        # Lines are dropped once the context reaches its budget; the prompt
+        # it feeds has a bounded size anyway
+        buffer = io.StringIO()
+        
+        def write(line: str) -> None:
+            if buffer.tell() < SOLUTION_CONTEXT_BUDGET:
+                buffer.write(line + "\n")
+        
+        write(f"Problem Query: {query}")
+        write(f"Problem Category: {problem_analysis.get('problem_category', 'general')}")
+        write(f"Urgency: {problem_analysis.get('urgency', 'medium')}")
+        write(f"Complexity: {problem_analysis.get('complexity', 'medium')}")
         
         sources = all_data.get("sources", {})
         
         # Add Confluence context
         confluence_data = sources.get("confluence", {}).get("data", [])
         if confluence_data:
-            context_parts.append("\nRELEVANT DOCUMENTATION:")
+            write("\nRELEVANT DOCUMENTATION:")
             for doc in confluence_data[:3]:  # Top 3 most relevant
-                context_parts.append(f"- {doc.get('title', 'N/A')}: {doc.get('excerpt', 'No excerpt')[:200]}...")
+                write(f"- {doc.get('title', 'N/A')}: {(doc.get('excerpt') or 'No excerpt')[:200]}...")
         
         # Add JIRA context
         jira_data = sources.get("jira", {}).get("data", [])
         if jira_data:
-            context_parts.append("\nRELATED ISSUES:")
+            write("\nRELATED ISSUES:")
             for issue in jira_data[:3]:  # Top 3 most relevant
-                context_parts.append(f"- {issue.get('key', 'N/A')}: {issue.get('summary', 'No summary')} (Status: {issue.get('status', 'N/A')})")
+                write(f"- {issue.get('key', 'N/A')}: {issue.get('summary', 'No summary')} (Status: {issue.get('status', 'N/A')})")
         
         # Add Code context
         code_data = sources.get("code", {}).get("data", [])
         if code_data:
-            context_parts.append("\nRELEVANT CODE:")
+            write("\nRELEVANT CODE:")
             for code_file in code_data[:3]:  # Top 3 most relevant
-                context_parts.append(f"- {code_file.get('file_path', 'N/A')}: {code_file.get('content_preview', 'No preview')[:150]}...")
+                write(f"- {code_file.get('file_path', 'N/A')}: {(code_file.get('content_preview') or 'No preview')[:150]}...")
         
-        return "\n".join(context_parts)
+        # Drop the newline after the last line
+        return buffer.getvalue()[:-1]
     
     def _build_solution_prompt(self, query: str, problem_analysis: Dict[str, Any], context: str) -> str:
         """Build comprehensive prompt for solution generation"""
@@ -637,40 +1072,14 @@ Format your response clearly with these sections. Focus on practical, actionable
             "related_issues": []
         }
         
-        lines = response.split('\n')
-        current_section = None
-        current_content = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Check for section headers
-            if 'SOLUTION SUMMARY' in line.upper() or 'SOLUTION:' in line.upper():
-                if current_section and current_content:
-                    sections[current_section] = self._process_section_content(current_section, current_content)
-                current_section = 'solution'
-                current_content = []
-            elif 'IMPLEMENTATION STEPS' in line.upper() or 'STEPS:' in line.upper():
-                if current_section and current_content:
-                    sections[current_section] = self._process_section_content(current_section, current_content)
-                current_section = 'steps'
-                current_content = []
-            elif 'POTENTIAL RISKS' in line.upper() or 'RISKS:' in line.upper():
-                if current_section and current_content:
-                    sections[current_section] = self._process_section_content(current_section, current_content)
-                current_section = 'risks'
-                current_content = []
-            elif 'RELATED ISSUES' in line.upper() or 'RELATED:' in line.upper():
-                if current_section and current_content:
-                    sections[current_section] = self._process_section_content(current_section, current_content)
-                current_section = 'related_issues'
-                current_content = []
-            elif line and current_section:
-                current_content.append(line)
-        
-        # Process final section
-        if current_section and current_content:
-            sections[current_section] = self._process_section_content(current_section, current_content)
+        # One scan finds every header line; each section's body runs to the
+        # next header, and text before the first header is ignored
+        headers = list(SOLUTION_SECTION_HEADER.finditer(response))
+        for header, next_header in zip(headers, headers[1:] + [None]):
+            body = response[header.end():next_header.start() if next_header else len(response)]
+            content = [line for line in (line.strip() for line in body.split('\n')) if line]
+            if content:
+                sections[header.lastgroup] = self._process_section_content(header.lastgroup, content)
         
         # If no sections were parsed, put everything in solution
         if not any(sections.values()) and response.strip():
@@ -684,16 +1093,16 @@ Format your response clearly with these sections. Focus on practical, actionable
         if section == 'solution':
             return '\n'.join(content).strip()
         else:  # steps, risks, related_issues
-            items = []
+            # Each item collects its lines, joined once at the end
+            items: List[List[str]] = []
             for line in content:
-                if line.startswith(('- ', '* ', '1. ', '2. ', '3. ')):
-                    items.append(line[2:].strip() if line.startswith(('- ', '* ')) else line.strip())
+                if line.startswith(LIST_ITEM_PREFIXES):
+                    items.append([line[2:].strip() if line.startswith(BULLET_PREFIXES) else line.strip()])
                 elif line and not items:  # First non-list line
-                    items.append(line.strip())
+                    items.append([line.strip()])
                 elif line and items:  # Continue previous item
-                    if items:
-                        items[-1] += ' ' + line.strip()
-            return items if items else ['\n'.join(content).strip()] if content else []
+                    items[-1].append(line.strip())
+            return [' '.join(item) for item in items] if items else ['\n'.join(content).strip()] if content else []
     
     def _calculate_confidence_score(self, all_data: Dict[str, Any], problem_analysis: Dict[str, Any]) -> float:
         """Calculate confidence score based on data quality and relevance"""
@@ -703,18 +1112,20 @@ Format your response clearly with these sections. Focus on practical, actionable
         # Base score
         confidence = 0.3
         
-        # Add points for each source with data
-        if sources.get("confluence", {}).get("count", 0) > 0:
-            confluence_scores = sources["confluence"].get("relevance_scores", [0])
-            confidence += 0.25 * (sum(confluence_scores) / len(confluence_scores) if confluence_scores else 0)
-        
-        if sources.get("jira", {}).get("count", 0) > 0:
-            jira_scores = sources["jira"].get("relevance_scores", [0])
-            confidence += 0.25 * (sum(jira_scores) / len(jira_scores) if jira_scores else 0)
+        scores = {
+            source: sources[source].get("relevance_scores", [])
+            for source in SOURCE_CONFIDENCE_WEIGHTS
+            if sources.get(source, {}).get("count", 0) > 0
+        }
         
-        if sources.get("code", {}).get("count", 0) > 0:
-            code_scores = sources["code"].get("relevance_scores", [0])
-            confidence += 0.25 * (sum(code_scores) / len(code_scores) if code_scores else 0)
+        # Each source with data adds its share, at least half of it and all of
+        # it when its top result clearly beats the rest, so another source's
+        # results never lower the score. Within a source, results covering
+        # more of the query count for more.
+        for source, values in scores.items():
+            weight = SOURCE_CONFIDENCE_WEIGHTS[source] * (0.5 + 0.5 * _decisiveness(values))
+            coverage = sources[source].get("query_coverage", [])
+            confidence += weight * _weighted_mean(values, coverage)
         
         # Adjust based on problem complexity
         if problem_analysis.get("complexity") == "low":
@@ -727,28 +1138,37 @@ Format your response clearly with these sections. Focus on practical, actionable
     async def _search_confluence_enhanced(self, queries: Dict[str, str], max_results: int) -> List[Dict[str, Any]]:
         """Enhanced Confluence search with multiple query strategies"""
         try:
-            # Try different queries and combine results
-            all_results = []
-            
-            # Search with enhanced query
-            results1 = await self.confluence_client.search_pages(queries["enhanced"], max_results // 2)
-            all_results.extend(results1)
-            
-            # Search with technical terms if different from enhanced
+            # Search with the enhanced query, plus the technical terms if they
+            # differ; the queries are independent so they run concurrently
+            search_queries = [queries["enhanced"]]
             if queries["technical"] != queries["enhanced"]:
-                results2 = await self.confluence_client.search_pages(queries["technical"], max_results // 2)
-                all_results.extend(results2)
+                search_queries.append(queries["technical"])
             
-            # Remove duplicates based on ID
-            seen_ids = set()
-            unique_results = []
+            responses = await asyncio.gather(
+                *(self._limited(self.confluence_client.search_pages(q, max_results // 2)) for q in search_queries),
+                return_exceptions=True
+            )
+            
+            # A failed query only loses its own results
+            all_results = []
+            for response in responses:
+                if isinstance(response, Exception):
+                    self.logger.error(f"Confluence query failed: {response}")
+                    continue
+                all_results.extend(response)
+            
+            # Merge duplicates by ID; a page found by both queries keeps its
+            # best relevance score
+            merged: Dict[str, Dict[str, Any]] = {}
             for result in all_results:
                 result_id = result.get('id')
-                if result_id and result_id not in seen_ids:
-                    seen_ids.add(result_id)
-                    unique_results.append(result)
+                if not result_id:
+                    continue
+                existing = merged.setdefault(result_id, result)
+                if existing is not result and result.get('relevance_score', 0) > existing.get('relevance_score', 0):
+                    merged[result_id] = {**existing, 'relevance_score': result['relevance_score']}
             
-            return unique_results[:max_results]
+            return list(merged.values())[:max_results]
             
         except Exception as e:
             self.logger.error(f"Enhanced Confluence search failed: {e}")
@@ -773,7 +1193,7 @@ Format your response clearly with these sections. Focus on practical, actionable
                     filters["issue_key_prefixes"] = search_options["jira_key_prefixes"]
             
             # Search with enhanced query and filters
-            results = await self.jira_client.search_by_text(queries["enhanced"], max_results, **filters)
+            results = await self._limited(self.jira_client.search_by_text(queries["enhanced"], max_results, **filters))
             
             return results
             
@@ -781,35 +1201,40 @@ Format your response clearly with these sections. Focus on practical, actionable
             self.logger.error(f"Enhanced JIRA search failed: {e}")
             return []
     
-    async def _search_code_enhanced(self, queries: Dict[str, str], file_types: List[str], problem_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _search_code_enhanced(self, queries: Dict[str, str], file_types: Optional[Iterable[str]], problem_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Enhanced code search with intelligent file type selection"""
         try:
             # Determine relevant file types based on problem analysis
             if not file_types:
                 file_types = self._suggest_file_types(problem_analysis)
             
-            # Search with multiple strategies
-            all_results = []
+            # Build the set once; it is shared by every search below
+            file_types = frozenset(file_types)
             
-            # Text search with enhanced query
-            text_results = self.code_reader.search_files(queries["enhanced"], file_types)
-            all_results.extend(text_results)
+            # Search for the enhanced query and each technical term (skipping
+            # short terms) in one pass over the repository. The scan blocks, so
+            # it runs in a worker thread
+            search_queries = [queries["enhanced"]]
+            search_queries.extend(term for term in problem_analysis.get("technical_terms", []) if len(term) > 3)
             
-            # Search for technical terms in code
-            for term in problem_analysis.get("technical_terms", []):
-                if len(term) > 3:  # Avoid short terms
-                    term_results = self.code_reader.search_files(term, file_types)
-                    all_results.extend(term_results)
+            results_by_query = await self._limited(
+                asyncio.to_thread(self.code_reader.search_files_multi, search_queries, file_types)
+            )
+            all_results = [result for query_results in results_by_query.values() for result in query_results]
             
-            # Remove duplicates and limit results
-            seen_paths = set()
-            unique_results = []
+            # Merge duplicates by path; a file matching several queries keeps
+            # every matching line once, so files with the most evidence rank first
+            merged: Dict[str, Dict[str, Any]] = {}
             for result in all_results:
                 path = result.get('file_path')
-                if path and path not in seen_paths:
-                    seen_paths.add(path)
-                    unique_results.append(result)
-            
+                if not path:
+                    continue
+                existing = merged.setdefault(path, result)
+                if existing is not result:
+                    lines = {match['line_number']: match for match in existing.get('matches', []) + result.get('matches', [])}
+                    merged[path] = {**existing, 'matches': sorted(lines.values(), key=lambda match: match['line_number'])}
+            
+            unique_results = sorted(merged.values(), key=lambda result: len(result.get('matches', [])), reverse=True)
             return unique_results[:15]  # Limit code results
             
         except Exception as e:
@@ -863,7 +1288,7 @@ Format your response clearly with these sections. Focus on practical, actionable
             user_context['search_preferences'] = search_strategy
             
             # Add timestamp for context freshness
-            user_context['context_timestamp'] = datetime.now().isoformat()
+            user_context['context_timestamp'] = _utc_timestamp()
             
         except Exception as e:
             self.logger.error(f"Error building user context: {e}")
@@ -890,13 +1315,18 @@ Format your response clearly with these sections. Focus on practical, actionable
     async def _search_code(self, query: str, file_types: List[str] = None) -> List[Dict[str, Any]]:
         """Search code repository for relevant files"""
         try:
-            # Try both text search and pattern search
-            text_results = self.code_reader.search_files(query, file_types)
+            # Try both text search and pattern search. Both are blocking file
+            # scans, so they run in worker threads, side by side
+            text_search = asyncio.to_thread(self.code_reader.search_files, query, file_types)
             
             # If query looks like a pattern, also try pattern search
-            pattern_results = []
             if any(char in query for char in ['*', '?', '[', ']', '^', '$']):
-                pattern_results = self.code_reader.search_by_pattern(query, file_types)
+                text_results, pattern_results = await asyncio.gather(
+                    text_search,
+                    asyncio.to_thread(self.code_reader.search_by_pattern, query, file_types)
+                )
+            else:
+                text_results, pattern_results = await text_search, []
             
             # Combine and deduplicate results
             all_results = text_results + pattern_results
@@ -922,7 +1352,8 @@ Format your response clearly with these sections. Focus on practical, actionable
         elif item_type == "jira":
             return await self.jira_client.get_issue_details(item_id)
         elif item_type == "code":
-            return self.code_reader.get_file_content(item_id)
+            # Reads and analyzes the file; keep that off the event loop
+            return await asyncio.to_thread(self.code_reader.get_file_content, item_id)
         else:
             return {"error": f"Unknown item type: {item_type}"}
     
@@ -966,20 +1397,20 @@ Format your response clearly with these sections. Focus on practical, actionable
             
         self.logger.info("Closing AI Agent connections")
         
-        try:
-            # Close clients in reverse order of initialization
-            if hasattr(self.jira_client, 'disconnect'):
-                await self.jira_client.disconnect()
-            
-            if hasattr(self.confluence_client, 'disconnect'):
-                await self.confluence_client.disconnect()
-            
-            if hasattr(self.ai_client, 'close'):
-                await self.ai_client.close()
-            
-            self._initialized = False
-            self.logger.info("AI Agent connections closed successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Error during cleanup: {e}")
-            # Don't re-raise cleanup errors
\ No newline at end of file
+        # Close every client concurrently; one failing must not leave the others open.
+        # In integrated mode both sources share one client, so it is closed once
+        clients = {id(c): c for c in (self.jira_client, self.confluence_client)}.values()
+        closers = [client.disconnect() for client in clients if hasattr(client, 'disconnect')]
+        if hasattr(self.ai_client, 'close'):
+            closers.append(self.ai_client.close())
+        
+        results = await asyncio.gather(*closers, return_exceptions=True)
+        self._initialized = False
+        
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            # Don't re-raise cleanup errors
+            for e in errors:
+                self.logger.error(f"Error during cleanup: {e}")
+        else:
+            self.logger.info("AI Agent connections closed successfully")
\ No newline at end of file
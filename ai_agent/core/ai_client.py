@@ -1,43 +1,111 @@
 import asyncio
 import json
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 import httpx
+import orjson
 from .config import Config
 
+# h2 is an optional speedup; httpx needs it for HTTP/2 and otherwise speaks HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Start of the text returned (or streamed) in place of an answer when a request fails
+AI_ERROR_PREFIX = "Error generating AI response"
+
 
 class CustomAIClient:
     """Client for interacting with custom AI API"""
     
     def __init__(self, config: Config):
         self.config = config
+        # One pooled client for every call: kept-alive connections skip the TLS
+        # handshake, and on HTTP/2 concurrent requests share a single connection
         self.client = httpx.AsyncClient(
-            timeout=60.0,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60.0),
             headers={
                 "Authorization": f"Bearer {config.custom_ai_api_key}",
                 "Content-Type": "application/json"
             }
         )
+        # Identical requests already on the wire, keyed by their serialized payload
+        self._in_flight: Dict[bytes, asyncio.Task] = {}
     
     async def generate_response(self, messages: List[Dict[str, str]], max_tokens: int = 2000) -> str:
-        """Generate response from custom AI API"""
+        """Generate response from custom AI API, sharing the result of an identical in-flight request"""
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.7
+        }
+        key = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._post(payload))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        
         try:
-            payload = {
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0.7
-            }
-            
-            response = await self.client.post(
-                self.config.custom_ai_api_url,
-                json=payload
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            
+            # Shielded so one caller giving up does not cancel the request for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return f"{AI_ERROR_PREFIX}: {str(e)}"
+    
+    def _forget(self, key: bytes, task: asyncio.Task) -> None:
+        """Drop a finished request, marking its error as seen if every caller gave up"""
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+    
+    async def _post(self, payload: Dict[str, Any]) -> str:
+        """POST a completion request and return the message content"""
+        response = await self.client.post(
+            self.config.custom_ai_api_url,
+            json=payload
+        )
+        response.raise_for_status()
+        
+        result = orjson.loads(response.content)
+        return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+    
+    async def stream_response(self, messages: List[Dict[str, str]], max_tokens: int = 2000) -> AsyncIterator[str]:
+        """Generate a response from the custom AI API, yielding text chunks as they arrive"""
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "stream": True
+        }
+        
+        try:
+            async with self.client.stream("POST", self.config.custom_ai_api_url, json=payload) as response:
+                response.raise_for_status()
+                
+                # APIs without streaming support answer with a single JSON body
+                if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                    result = orjson.loads(await response.aread())
+                    yield result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    return
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = orjson.loads(data).get("choices", [{}])[0].get("delta", {}).get("content")
+                    if chunk:
+                        yield chunk
+                        
         except Exception as e:
-            return f"Error generating AI response: {str(e)}"
+            yield f"{AI_ERROR_PREFIX}: {str(e)}"
     
     async def analyze_context(self, query: str, confluence_data: List[Dict], 
                             jira_data: List[Dict], code_data: List[Dict]) -> str:
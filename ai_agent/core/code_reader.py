@@ -1,10 +1,108 @@
+import copy
 import os
 import json
 import re
 import fnmatch
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, FrozenSet, Iterable, List, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
 
+from cachetools import LRUCache
+
+
+# Extension -> language table, built once at import time
+EXTENSION_LANGUAGES = {
+    '.java': 'java',
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.xml': 'xml',
+    '.sh': 'shell',
+    '.bash': 'shell',
+    '.zsh': 'shell',
+    '.sql': 'sql',
+    '.md': 'markdown',
+    '.txt': 'text',
+    '.properties': 'properties',
+    '.conf': 'config'
+}
+
+# Version-control metadata directories are never searched
+VCS_METADATA_DIRS = frozenset({'.git', '.hg', '.svn'})
+
+# Structure patterns for get_file_content's language analysis
+JAVA_CLASS = re.compile(r'class\s+(\w+)')
+JAVA_INTERFACE = re.compile(r'interface\s+(\w+)')
+JAVA_METHOD = re.compile(r'(?:public|private|protected)?\s*\w+\s+(\w+)\s*\(')
+JAVA_IMPORT = re.compile(r'import\s+([\w.]+);')
+JAVA_PACKAGE = re.compile(r'package\s+([\w.]+);')
+
+PYTHON_CLASS = re.compile(r'class\s+(\w+)')
+PYTHON_FUNCTION = re.compile(r'def\s+(\w+)')
+PYTHON_IMPORT = re.compile(r'(?:from\s+[\w.]+\s+)?import\s+([\w.,\s*]+)')
+PYTHON_DOCSTRING = re.compile(r'"""(.*?)"""', re.DOTALL)
+
+SHELL_FUNCTION = re.compile(r'(\w+)\s*\(\s*\)\s*{')
+SHELL_VARIABLE = re.compile(r'(\w+)=')
+SHELL_COMMAND = re.compile(r'^([a-zA-Z][\w-]*)', re.MULTILINE)
+
+# Seconds a repository file listing is reused when no config is given
+DEFAULT_FILE_LIST_TTL = 30.0
+
+# UTF-8 encodings of the only non-ASCII characters whose lowercase form
+# contains ASCII (U+0130 and U+212A); files with them are matched as text
+ASCII_LOWERING_MARKERS = ('\u0130'.encode(), '\u212a'.encode())
+
+# Bytes of file content cached when no config is given
+DEFAULT_FILE_CACHE_SIZE = 256 * 1024 * 1024
+
+# Files whose language analysis get_file_content keeps
+ANALYSIS_CACHE_SIZE = 4096
+
+# Matching lines reported per file and query
+MAX_MATCHES = 20
+
+# Every separator str.splitlines() splits on
+LINE_BREAKS = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _decode(data: bytes) -> str:
+    """Text of a file as open() in text mode reads it: UTF-8, else latin-1, with universal newlines"""
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class _LineIndex:
+    """A file's lines with their start offsets, for mapping matches found in the whole content to lines"""
+    
+    def __init__(self, content: str, content_lower: str):
+        self.content = content
+        self.content_lower = content_lower
+        self.lines = content.splitlines()
+        self.line_starts = list(accumulate((len(line) for line in content.splitlines(keepends=True)), initial=0))
+        self.offsets_align = len(content_lower) == len(content)
+    
+    def lines_containing(self, query_lower: str, limit: int) -> List[int]:
+        """Indexes of up to limit lines whose lowercased text contains query_lower"""
+        found = []
+        end = len(self.content_lower)
+        position = self.content_lower.find(query_lower)
+        while position != -1 and position < end and len(found) < limit:
+            line_num = bisect_right(self.line_starts, position) - 1
+            found.append(line_num)
+            # Later hits on the same line don't count again
+            position = self.content_lower.find(query_lower, self.line_starts[line_num + 1])
+        return found
+
 
 class CodeRepositoryReader:
     """Reader for various code file types in the repository with intelligent filtering"""
@@ -12,7 +110,6 @@ class CodeRepositoryReader:
     def __init__(self, repo_path: str, config=None):
         self.repo_path = Path(repo_path)
         self.config = config
-        self.file_cache = {}
         
         # Load configuration-based settings or use defaults
         if config:
@@ -23,24 +120,14 @@ class CodeRepositoryReader:
             self.exclude_patterns = config.code_exclude_patterns
             self.exclude_paths = config.code_exclude_paths
             self.max_file_size = config.code_max_file_size
+            self.file_list_ttl = config.code_file_list_ttl
+            file_cache_size = config.code_file_cache_size
         else:
-            # Default fallback
+            # Default fallback (matches Config.code_supported_extensions,
+            # which recognises .zsh but does not search it by default)
             self.supported_extensions = {
-                '.java': 'java',
-                '.py': 'python',
-                '.js': 'javascript',
-                '.ts': 'typescript',
-                '.json': 'json',
-                '.yaml': 'yaml',
-                '.yml': 'yaml',
-                '.xml': 'xml',
-                '.sh': 'shell',
-                '.bash': 'shell',
-                '.sql': 'sql',
-                '.md': 'markdown',
-                '.txt': 'text',
-                '.properties': 'properties',
-                '.conf': 'config'
+                ext: language for ext, language in EXTENSION_LANGUAGES.items()
+                if ext != '.zsh'
             }
             self.exclude_patterns = [
                 "node_modules/*", "target/*", "build/*", "dist/*", ".git/*",
@@ -48,57 +135,106 @@ class CodeRepositoryReader:
             ]
             self.exclude_paths = []
             self.max_file_size = 1048576  # 1MB
+            self.file_list_ttl = DEFAULT_FILE_LIST_TTL
+            file_cache_size = DEFAULT_FILE_CACHE_SIZE
+        
+        # Recently read raw file contents, as path -> ((mtime_ns, size), data),
+        # bounded by total size; least recently used files go first
+        self.file_cache: LRUCache = LRUCache(maxsize=file_cache_size, getsizeof=lambda entry: len(entry[1]))
+        self._file_cache_lock = threading.Lock()
+        
+        # Language analysis of recently viewed files, as path -> ((mtime_ns, size), analysis)
+        self.analysis_cache: LRUCache = LRUCache(maxsize=ANALYSIS_CACHE_SIZE)
+        self._analysis_cache_lock = threading.Lock()
+        
+        # Supported files found by the last walk, and when it finished; searches
+        # reuse the listing for file_list_ttl seconds (0 walks every time)
+        self._file_list: Optional[List[Path]] = None
+        self._file_list_time = 0.0
+        # Searches run in worker threads; concurrent ones on a stale listing
+        # wait for a single walk
+        self._file_list_lock = threading.Lock()
+        
+        # All exclusion globs folded into one compiled regex so each path
+        # component is tested with a single match instead of one fnmatch per pattern
+        self._exclude_regex = re.compile(
+            '|'.join(fnmatch.translate(pattern) for pattern in self.exclude_patterns)
+        ) if self.exclude_patterns else None
     
     def _get_language_from_ext(self, ext: str) -> str:
         """Map file extension to language type"""
-        ext_map = {
-            '.java': 'java',
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.json': 'json',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.xml': 'xml',
-            '.sh': 'shell',
-            '.bash': 'shell',
-            '.zsh': 'shell',
-            '.sql': 'sql',
-            '.md': 'markdown',
-            '.txt': 'text',
-            '.properties': 'properties',
-            '.conf': 'config'
-        }
-        return ext_map.get(ext.lower(), 'text')
+        return EXTENSION_LANGUAGES.get(ext.lower(), 'text')
     
-    def search_files(self, query: str, file_types: List[str] = None) -> List[Dict[str, Any]]:
+    def search_files(self, query: str, file_types: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """Search for files containing the query text"""
-        if file_types is None:
-            file_types = list(self.supported_extensions.values())
+        return self.search_files_multi([query], file_types)[query]
+    
+    def search_files_multi(self, queries: Iterable[str], file_types: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for files containing each of several query texts.
         
-        results = []
+        The repository is walked and each file read and lowercased once for
+        all queries, rather than once per query.
         
-        for file_path in self._get_all_files():
-            if self._get_file_type(file_path) not in file_types:
+        Returns:
+            Each query mapped to the results search_files would give for it
+        """
+        file_types = self._file_type_filter(file_types)
+        lowered_queries = {query: query.lower() for query in queries}
+        # ASCII queries are first looked for in the raw bytes; None marks a
+        # query that can only be matched against decoded text
+        query_bytes = {query: query_lower.encode('ascii') if query_lower.isascii() else None
+                       for query, query_lower in lowered_queries.items()}
+        
+        results = {query: [] for query in lowered_queries}
+        
+        for file_path in self.iter_all_files():
+            file_type = self._get_file_type(file_path)
+            if file_type not in file_types:
                 continue
             
             try:
-                content = self._read_file(file_path)
-                if self._contains_query(content, query):
-                    result = {
-                        'file_path': str(file_path.relative_to(self.repo_path)),
-                        'full_path': str(file_path),
-                        'file_type': self._get_file_type(file_path),
-                        'content_preview': self._get_content_preview(content, query),
-                        'matches': self._find_matches(content, query),
-                        'size': file_path.stat().st_size,
-                        'modified': file_path.stat().st_mtime
+                data = self._read_file_bytes(file_path)
+                
+                # Only decode files that may contain a query. ASCII bytes mean
+                # the same in UTF-8 and latin-1, so an ASCII query is in the text
+                # exactly when it is in the bytes, unless the file has one of the
+                # characters whose lowercase form is ASCII
+                candidates = lowered_queries
+                if not any(marker in data for marker in ASCII_LOWERING_MARKERS):
+                    data_lower = data.lower()
+                    candidates = {
+                        query: query_lower for query, query_lower in lowered_queries.items()
+                        if query_bytes[query] is None or query_bytes[query] in data_lower
                     }
-                    results.append(result)
+                    if not candidates:
+                        continue
+                
+                content = _decode(data)
+                content_lower = content.lower()
+                line_index = None
+                for query, query_lower in candidates.items():
+                    if query_lower in content_lower:
+                        # Split the file into lines once, for whichever queries match it
+                        if line_index is None:
+                            line_index = _LineIndex(content, content_lower)
+                        preview, matches = self._match_details(line_index, query, query_lower)
+                        results[query].append({
+                            'file_path': str(file_path.relative_to(self.repo_path)),
+                            'full_path': str(file_path),
+                            'file_type': file_type,
+                            'content_preview': preview,
+                            'matches': matches,
+                            'size': file_path.stat().st_size,
+                            'modified': file_path.stat().st_mtime
+                        })
             except Exception as e:
                 continue
         
-        return sorted(results, key=lambda x: len(x['matches']), reverse=True)
+        return {
+            query: sorted(query_results, key=lambda x: len(x['matches']), reverse=True)
+            for query, query_results in results.items()
+        }
     
     def get_file_content(self, file_path: str) -> Dict[str, Any]:
         """Get full content and metadata for a specific file"""
@@ -108,6 +244,7 @@ class CodeRepositoryReader:
             return {}
         
         try:
+            stat = full_path.stat()
             content = self._read_file(full_path)
             file_type = self._get_file_type(full_path)
             
@@ -116,30 +253,47 @@ class CodeRepositoryReader:
                 'full_path': str(full_path),
                 'file_type': file_type,
                 'content': content,
-                'size': full_path.stat().st_size,
-                'modified': full_path.stat().st_mtime,
+                'size': stat.st_size,
+                'modified': stat.st_mtime,
                 'lines': len(content.splitlines())
             }
             
             # Add language-specific analysis
-            if file_type == 'java':
-                result['analysis'] = self._analyze_java(content)
-            elif file_type == 'python':
-                result['analysis'] = self._analyze_python(content)
-            elif file_type == 'json':
-                result['analysis'] = self._analyze_json(content)
-            elif file_type == 'shell':
-                result['analysis'] = self._analyze_shell(content)
+            analysis = self._cached_analysis(full_path, (stat.st_mtime_ns, stat.st_size), file_type, content)
+            if analysis is not None:
+                result['analysis'] = analysis
             
             return result
             
         except Exception as e:
             return {'error': str(e)}
     
-    def search_by_pattern(self, pattern: str, file_types: List[str] = None) -> List[Dict[str, Any]]:
+    def _cached_analysis(self, full_path: Path, version: Tuple[int, int], file_type: str, content: str) -> Optional[Dict[str, Any]]:
+        """Language analysis of a file, reused while its mtime and size are unchanged"""
+        key = str(full_path)
+        with self._analysis_cache_lock:
+            cached = self.analysis_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return copy.deepcopy(cached[1])
+        
+        if file_type == 'java':
+            analysis = self._analyze_java(content)
+        elif file_type == 'python':
+            analysis = self._analyze_python(content)
+        elif file_type == 'json':
+            analysis = self._analyze_json(content)
+        elif file_type == 'shell':
+            analysis = self._analyze_shell(content)
+        else:
+            return None
+        
+        with self._analysis_cache_lock:
+            self.analysis_cache[key] = (version, analysis)
+        return copy.deepcopy(analysis)
+    
+    def search_by_pattern(self, pattern: str, file_types: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """Search files using regex pattern"""
-        if file_types is None:
-            file_types = list(self.supported_extensions.values())
+        file_types = self._file_type_filter(file_types)
         
         try:
             regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
@@ -148,8 +302,9 @@ class CodeRepositoryReader:
         
         results = []
         
-        for file_path in self._get_all_files():
-            if self._get_file_type(file_path) not in file_types:
+        for file_path in self.iter_all_files():
+            file_type = self._get_file_type(file_path)
+            if file_type not in file_types:
                 continue
             
             try:
@@ -160,7 +315,7 @@ class CodeRepositoryReader:
                     result = {
                         'file_path': str(file_path.relative_to(self.repo_path)),
                         'full_path': str(file_path),
-                        'file_type': self._get_file_type(file_path),
+                        'file_type': file_type,
                         'pattern_matches': matches[:10],  # Limit matches
                         'match_count': len(matches),
                         'content_preview': self._get_pattern_preview(content, regex)
@@ -171,35 +326,71 @@ class CodeRepositoryReader:
         
         return sorted(results, key=lambda x: x['match_count'], reverse=True)
     
+    def _file_type_filter(self, file_types: Optional[Iterable[str]]) -> FrozenSet[str]:
+        """Normalise a file type filter into a set for O(1) per-file membership tests"""
+        if file_types is None:
+            return frozenset(self.supported_extensions.values())
+        return file_types if isinstance(file_types, frozenset) else frozenset(file_types)
+    
     def _get_all_files(self) -> List[Path]:
         """Get all supported files in the repository, respecting exclusion patterns"""
-        files = []
+        return list(self.iter_all_files())
+    
+    def iter_all_files(self) -> Iterator[Path]:
+        """Yield supported files in the repository, respecting exclusion patterns"""
+        if not self.file_list_ttl:
+            for entry in self.iter_file_entries():
+                yield Path(entry.path)
+            return
         
-        for root, dirs, filenames in os.walk(self.repo_path):
-            # Convert to Path for easier manipulation
-            root_path = Path(root)
-            
-            # Filter directories based on exclusion patterns
-            dirs_to_remove = []
-            for d in dirs:
-                dir_path = root_path / d
-                if self._should_exclude_path(dir_path):
-                    dirs_to_remove.append(d)
+        yield from self._cached_file_list()
+    
+    def _cached_file_list(self) -> List[Path]:
+        """Supported files in the repository, walking it again once the listing is older than file_list_ttl"""
+        with self._file_list_lock:
+            if self._file_list is None or time.monotonic() - self._file_list_time >= self.file_list_ttl:
+                self._file_list = [Path(entry.path) for entry in self.iter_file_entries()]
+                self._file_list_time = time.monotonic()
+            return self._file_list
+    
+    def iter_file_entries(self) -> Iterator[os.DirEntry]:
+        """
+        Lazily yield os.DirEntry objects for supported files in the repository.
+        
+        Each entry's stat() result is already cached from the size check, so
+        callers can read st_mtime/st_size without another system call.
+        """
+        # os.scandir hands back file-type information from the directory
+        # listing itself, so only candidate files need a stat() call
+        pending_dirs = [self.repo_path]
+        
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
             
-            # Remove excluded directories from traversal
-            for d in dirs_to_remove:
-                dirs.remove(d)
+            try:
+                entries = os.scandir(current_dir)
+            except OSError:
+                continue
             
-            # Process files in current directory
-            for filename in filenames:
-                file_path = root_path / filename
-                
-                if (self._is_supported_file(file_path) and 
-                    not self._should_exclude_path(file_path) and
-                    self._is_valid_file_size(file_path)):
-                    files.append(file_path)
-        
-        return files
+            with entries:
+                for entry in entries:
+                    entry_path = Path(entry.path)
+                    
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    
+                    if is_dir:
+                        # Never descend into VCS metadata or through symlinks
+                        if (entry.name not in VCS_METADATA_DIRS and
+                            not entry.is_symlink() and
+                            not self._should_exclude_path(entry_path)):
+                            pending_dirs.append(entry_path)
+                    elif (self._is_supported_file(entry_path) and 
+                          not self._should_exclude_path(entry_path) and
+                          self._is_valid_file_size(entry)):
+                        yield entry
     
     def _should_exclude_path(self, file_path: Path) -> bool:
         """Check if path should be excluded based on patterns"""
@@ -208,15 +399,15 @@ class CodeRepositoryReader:
             relative_path = file_path.relative_to(self.repo_path)
             relative_str = str(relative_path)
             
-            # Check against exclude patterns (supports wildcards)
-            for pattern in self.exclude_patterns:
-                if fnmatch.fnmatch(relative_str, pattern) or fnmatch.fnmatch(str(file_path.name), pattern):
-                    return True
-                    
-                # Also check directory patterns
-                for part in relative_path.parts:
-                    if fnmatch.fnmatch(part, pattern):
-                        return True
+            # Check against exclude patterns (supports wildcards), including
+            # each directory component of the path
+            exclude_match = self._exclude_regex.match if self._exclude_regex else None
+            if exclude_match and (
+                exclude_match(relative_str) or
+                exclude_match(file_path.name) or
+                any(exclude_match(part) for part in relative_path.parts)
+            ):
+                return True
             
             # Check against specific exclude paths
             for exclude_path in self.exclude_paths:
@@ -235,7 +426,7 @@ class CodeRepositoryReader:
             # If there's an error in exclusion checking, err on the side of inclusion
             return False
     
-    def _is_valid_file_size(self, file_path: Path) -> bool:
+    def _is_valid_file_size(self, file_path: Union[Path, os.DirEntry]) -> bool:
         """Check if file size is within acceptable limits"""
         try:
             return file_path.stat().st_size <= self.max_file_size
@@ -251,47 +442,87 @@ class CodeRepositoryReader:
         return self.supported_extensions.get(file_path.suffix.lower(), 'unknown')
     
     def _read_file(self, file_path: Path) -> str:
-        """Read file content with caching"""
-        if str(file_path) in self.file_cache:
-            return self.file_cache[str(file_path)]
+        """Read file content as text"""
+        return _decode(self._read_file_bytes(file_path))
+    
+    def _read_file_bytes(self, file_path: Path) -> bytes:
+        """Read raw file content, reusing the cached copy while the file's mtime and size are unchanged"""
+        key = str(file_path)
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                self.file_cache[str(file_path)] = content
-                return content
-        except UnicodeDecodeError:
-            # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-                self.file_cache[str(file_path)] = content
-                return content
+        with self._file_cache_lock:
+            cached = self.file_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        with self._file_cache_lock:
+            try:
+                self.file_cache[key] = (version, data)
+            except ValueError:
+                pass  # Larger than the whole cache
+        return data
     
     def _contains_query(self, content: str, query: str) -> bool:
         """Check if content contains query (case-insensitive)"""
         return query.lower() in content.lower()
     
+    def _match_details(self, line_index: _LineIndex, query: str, query_lower: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Content preview and line matches of a query, as _get_content_preview and _find_matches give them"""
+        content, lines = line_index.content, line_index.lines
+        
+        # Offsets in the lowercased content only map back to lines when
+        # lowercasing kept every character's length and the query is one line
+        if not line_index.offsets_align or LINE_BREAKS.search(query):
+            return self._get_content_preview(content, query), self._find_matches(content, query)
+        
+        line_numbers = line_index.lines_containing(query_lower, MAX_MATCHES)
+        matches = [
+            {
+                'line_number': line_num + 1,
+                'line_content': lines[line_num].strip(),
+                'context': self._get_line_context(lines, line_num, 2)
+            }
+            for line_num in line_numbers
+        ]
+        
+        if not line_numbers:
+            return (content[:300] + "..." if len(content) > 300 else content), matches
+        
+        start = max(0, line_numbers[0] - 3)
+        end = min(len(lines), line_numbers[0] + 4)
+        preview = '\n'.join(f"{start + j + 1:4}: {line}" for j, line in enumerate(lines[start:end]))
+        return preview, matches
+    
     def _find_matches(self, content: str, query: str) -> List[Dict[str, Any]]:
-        """Find all occurrences of query in content"""
+        """Find the first MAX_MATCHES occurrences of query in content"""
         matches = []
+        query_lower = query.lower()
         lines = content.splitlines()
         
-        for line_num, line in enumerate(lines, 1):
-            if query.lower() in line.lower():
+        # Lowercasing never adds or removes line breaks, so the lines pair up
+        for line_num, line_lower in enumerate(content.lower().splitlines()):
+            if query_lower in line_lower:
                 matches.append({
-                    'line_number': line_num,
-                    'line_content': line.strip(),
-                    'context': self._get_line_context(lines, line_num - 1, 2)
+                    'line_number': line_num + 1,
+                    'line_content': lines[line_num].strip(),
+                    'context': self._get_line_context(lines, line_num, 2)
                 })
+                if len(matches) >= MAX_MATCHES:
+                    break
         
-        return matches[:20]  # Limit to 20 matches
+        return matches
     
     def _get_content_preview(self, content: str, query: str) -> str:
         """Get preview of content around the query"""
         lines = content.splitlines()
+        query_lower = query.lower()
         
         for i, line in enumerate(lines):
-            if query.lower() in line.lower():
+            if query_lower in line.lower():
                 start = max(0, i - 3)
                 end = min(len(lines), i + 4)
                 preview_lines = lines[start:end]
@@ -321,11 +552,11 @@ class CodeRepositoryReader:
     def _analyze_java(self, content: str) -> Dict[str, Any]:
         """Analyze Java file structure"""
         analysis = {
-            'classes': re.findall(r'class\s+(\w+)', content),
-            'interfaces': re.findall(r'interface\s+(\w+)', content),
-            'methods': re.findall(r'(?:public|private|protected)?\s*\w+\s+(\w+)\s*\(', content),
-            'imports': re.findall(r'import\s+([\w.]+);', content),
-            'package': re.search(r'package\s+([\w.]+);', content)
+            'classes': JAVA_CLASS.findall(content),
+            'interfaces': JAVA_INTERFACE.findall(content),
+            'methods': JAVA_METHOD.findall(content),
+            'imports': JAVA_IMPORT.findall(content),
+            'package': JAVA_PACKAGE.search(content)
         }
         if analysis['package']:
             analysis['package'] = analysis['package'].group(1)
@@ -334,10 +565,10 @@ class CodeRepositoryReader:
     def _analyze_python(self, content: str) -> Dict[str, Any]:
         """Analyze Python file structure"""
         return {
-            'classes': re.findall(r'class\s+(\w+)', content),
-            'functions': re.findall(r'def\s+(\w+)', content),
-            'imports': re.findall(r'(?:from\s+[\w.]+\s+)?import\s+([\w.,\s*]+)', content),
-            'docstrings': re.findall(r'"""(.*?)"""', content, re.DOTALL)[:3]  # First 3 docstrings
+            'classes': PYTHON_CLASS.findall(content),
+            'functions': PYTHON_FUNCTION.findall(content),
+            'imports': PYTHON_IMPORT.findall(content),
+            'docstrings': PYTHON_DOCSTRING.findall(content)[:3]  # First 3 docstrings
         }
     
     def _analyze_json(self, content: str) -> Dict[str, Any]:
@@ -360,7 +591,7 @@ class CodeRepositoryReader:
         """Analyze shell script structure"""
         return {
             'shebang': content.split('\n')[0] if content.startswith('#!') else None,
-            'functions': re.findall(r'(\w+)\s*\(\s*\)\s*{', content),
-            'variables': re.findall(r'(\w+)=', content),
-            'commands': re.findall(r'^([a-zA-Z][\w-]*)', content, re.MULTILINE)[:20]  # First 20 commands
+            'functions': SHELL_FUNCTION.findall(content),
+            'variables': SHELL_VARIABLE.findall(content),
+            'commands': SHELL_COMMAND.findall(content)[:20]  # First 20 commands
         }
\ No newline at end of file
@@ -3,6 +3,7 @@ Configuration management for the AI agent using Pydantic v2 patterns
 """
 from __future__ import annotations
 
+import functools
 import json
 import os
 from typing import Optional, List, Union, Any
@@ -160,6 +161,43 @@ class Config(BaseSettings):
         le=10485760,  # 10MB max
         description="Maximum file size to process (bytes)"
     )
+    code_file_list_ttl: float = Field(
+        default=30.0, 
+        ge=0.0, 
+        description="Seconds a repository file listing is reused by code searches (0 lists on every search)"
+    )
+    code_file_cache_size: int = Field(
+        default=268435456, 
+        ge=0, 
+        description="Bytes of file content code searches keep cached (0 disables)"
+    )
+    
+    # Search Configuration
+    max_concurrent_searches: int = Field(
+        default=4, 
+        ge=1, 
+        le=256, 
+        description="Maximum backend search requests in flight across all queries"
+    )
+    enable_semantic_cache: bool = Field(default=False, description="Reuse responses of recent similar queries")
+    semantic_cache_size: int = Field(default=1000, ge=1, le=100000, description="Maximum responses in the semantic cache")
+    semantic_cache_ttl: int = Field(default=300, ge=1, description="Semantic cache entry lifetime in seconds")
+    semantic_cache_threshold: float = Field(
+        default=0.9, 
+        ge=0.0, 
+        le=1.0, 
+        description="Minimum query similarity for a semantic cache hit"
+    )
+    enable_direct_answers: bool = Field(
+        default=True, 
+        description="Answer documentation lookups with their top result instead of AI synthesis"
+    )
+    direct_answer_threshold: float = Field(
+        default=0.9, 
+        ge=0.0, 
+        le=1.0, 
+        description="Minimum ranking score of the top result for a direct answer"
+    )
     
     # MCP Server Configuration
     confluence_mcp_server_url: str = Field(..., description="Confluence MCP server WebSocket URL")
@@ -305,10 +343,14 @@ class Config(BaseSettings):
         return v.strip()
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Config:
     """
     Load configuration from environment variables and .env file
     
+    The result is cached for the lifetime of the process; call
+    ``load_config.cache_clear()`` to force the environment to be re-read.
+    
     Returns:
         Validated Config instance
         
@@ -293,7 +293,8 @@ class NLPProcessor:
         versions = re.findall(r'v?\d+\.\d+(?:\.\d+)?', query)
         found_terms.extend(versions)
         
-        return list(set(found_terms))
+        # Drop duplicates, keeping first-seen order
+        return list(dict.fromkeys(found_terms))
     
     def _classify_query_type(self, query: str) -> QueryType:
         """Classify query type using pattern matching"""
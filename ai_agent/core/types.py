@@ -10,8 +10,10 @@ from datetime import datetime
 from enum import Enum
 from typing import (
     TypedDict, 
+    AsyncIterator, 
     Optional, 
     List, 
+    Iterable, 
     Dict, 
     Any, 
     Union, 
@@ -164,10 +166,12 @@ class SearchStrategy(TypedDict):
     search_jira: bool
     search_code: bool
     max_results: int
-    file_types: Optional[List[str]]
+    file_types: Optional[Iterable[str]]  # any iterable; consumers build a set
     confluence_spaces: Optional[List[str]]
     jira_projects: Optional[List[str]]
     jira_key_prefixes: Optional[List[str]]
+    max_concurrency: Optional[int]
+    early_stop_threshold: Optional[int]
     priority_boost: Dict[SourceType, float]
 
 
@@ -286,6 +290,12 @@ class AIClientProtocol(Protocol):
         max_tokens: Optional[int] = None
     ) -> str: ...
     
+    def stream_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]: ...
+    
     async def close(self) -> None: ...
 
 
@@ -18,6 +18,7 @@ from .monitoring import (
 )
 from .batch_processor import BatchProcessor, TaskStatus, TaskPriority, batch_processor
 from .semantic_search import SemanticSearchEngine, SearchResult, semantic_search
+from .semantic_cache import SemanticCache
 from .health_checks import (
     ConfigurationValidator, SystemHealthMonitor, HealthCheckManager,
     HealthStatus, HealthCheckResult, health_check_manager
@@ -38,7 +39,7 @@ __all__ = [
     "BatchProcessor", "TaskStatus", "TaskPriority", "batch_processor",
     
     # Semantic Search
-    "SemanticSearchEngine", "SearchResult", "semantic_search",
+    "SemanticSearchEngine", "SearchResult", "semantic_search", "SemanticCache",
     
     # Health Checks
     "ConfigurationValidator", "SystemHealthMonitor", "HealthCheckManager",
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, List, Any, Optional, Callable, Union
+from typing import AsyncIterator, Dict, List, Any, Optional, Callable, Union
 from dataclasses import dataclass
 from enum import Enum
 import time
@@ -94,6 +94,10 @@ class TaskQueue:
         """Mark task as done"""
         self._queue.task_done()
     
+    def qsize(self) -> int:
+        """Number of tasks waiting for a worker"""
+        return self._queue.qsize()
+    
     def get_task(self, task_id: str) -> Optional[BatchTask]:
         """Get task by ID"""
         return self._task_registry.get(task_id)
@@ -164,6 +168,14 @@ class BatchProcessor:
         # Shutdown thread pool
         self.worker_pool.shutdown(wait=True)
     
+    def queue_depth(self) -> int:
+        """Number of submitted tasks not yet picked up by a worker"""
+        return self.task_queue.qsize()
+    
+    def can_accept(self, task_count: int) -> bool:
+        """Check whether task_count more tasks fit in the queue without blocking the submitter"""
+        return self.queue_depth() + task_count <= self.task_queue.max_size
+    
     async def submit_batch(self, 
                           tasks: List[Dict[str, Any]], 
                           batch_name: Optional[str] = None,
@@ -264,23 +276,8 @@ class BatchProcessor:
             end_time = max(t.completed_at or time.time() for t in tasks)
             total_time = end_time - start_time
         
-        results = []
-        for task in completed_tasks:
-            results.append({
-                'task_id': task.id,
-                'task_name': task.name,
-                'result': task.result,
-                'execution_time': (task.completed_at or 0) - (task.started_at or 0)
-            })
-        
-        errors = []
-        for task in failed_tasks:
-            errors.append({
-                'task_id': task.id,
-                'task_name': task.name,
-                'error': task.error,
-                'retry_count': task.retry_count
-            })
+        results = [_task_result(task) for task in completed_tasks]
+        errors = [_task_error(task) for task in failed_tasks]
         
         success_rate = len(completed_tasks) / len(tasks) * 100 if tasks else 0
         
@@ -295,6 +292,26 @@ class BatchProcessor:
             errors=errors
         )
     
+    def has_batch(self, batch_id: str) -> bool:
+        """Check whether a batch is known to this processor"""
+        return batch_id in self.active_batches
+    
+    async def iter_batch_results(self, batch_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one record per finished task of a batch, in submission order
+        
+        Completed tasks yield their result record and failed tasks their error
+        record, each tagged with a status; unfinished tasks are skipped.
+        """
+        batch = self.active_batches.get(batch_id)
+        if not batch:
+            return
+        
+        for task in batch['tasks']:
+            if task.status == TaskStatus.COMPLETED:
+                yield {'status': task.status.value, **_task_result(task)}
+            elif task.status == TaskStatus.FAILED:
+                yield {'status': task.status.value, **_task_error(task)}
+    
     async def cancel_batch(self, batch_id: str) -> bool:
         """Cancel a batch operation"""
         batch = self.active_batches.get(batch_id)
@@ -449,5 +466,25 @@ class BatchProcessor:
         }
 
 
+def _task_result(task: BatchTask) -> Dict[str, Any]:
+    """Result record of a completed task"""
+    return {
+        'task_id': task.id,
+        'task_name': task.name,
+        'result': task.result,
+        'execution_time': (task.completed_at or 0) - (task.started_at or 0)
+    }
+
+
+def _task_error(task: BatchTask) -> Dict[str, Any]:
+    """Error record of a failed task"""
+    return {
+        'task_id': task.id,
+        'task_name': task.name,
+        'error': task.error,
+        'retry_count': task.retry_count
+    }
+
+
 # Global batch processor instance
 batch_processor = BatchProcessor()
\ No newline at end of file
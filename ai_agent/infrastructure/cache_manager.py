@@ -1,7 +1,9 @@
 import asyncio
+import itertools
 import json
 import time
 import hashlib
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta
 import aiofiles
@@ -13,12 +15,70 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 
+class CostAwareTTLCache(TTLCache):
+    """TTL cache with v-LRU eviction
+    
+    When full, the least recently used candidate_fraction of entries are
+    considered and the one with the lowest recompute cost plus hit count is
+    evicted, so expensive or popular entries outlive cheap one-off ones.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, candidate_fraction: float = 0.1):
+        super().__init__(maxsize, ttl)
+        self.candidate_fraction = candidate_fraction
+        # key -> [cost, hits], least recently used first
+        self._usage: OrderedDict = OrderedDict()
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        usage = self._usage.get(key)
+        if usage is not None:
+            usage[1] += 1
+            self._usage.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._usage[key] = [0.0, 0]
+        self._usage.move_to_end(key)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._usage.pop(key, None)
+    
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            self._usage.pop(key, None)
+        return expired
+    
+    def clear(self):
+        super().clear()
+        self._usage.clear()
+    
+    def popitem(self):
+        self.expire()
+        if not self._usage:
+            return super().popitem()
+        
+        count = max(1, int(len(self._usage) * self.candidate_fraction))
+        candidates = itertools.islice(self._usage.items(), count)
+        victim = min(candidates, key=lambda item: item[1][0] + item[1][1])[0]
+        return victim, self.pop(victim)
+    
+    def record_cost(self, key, cost: float) -> None:
+        """Record how expensive an entry was to compute"""
+        usage = self._usage.get(key)
+        if usage is not None:
+            usage[0] = cost
+
+
 class CacheManager:
     """Advanced caching system with multiple storage backends"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.memory_cache = TTLCache(
+        self.memory_cache = CostAwareTTLCache(
             maxsize=config.get('memory_cache_size', 1000),
             ttl=config.get('memory_cache_ttl', 300)  # 5 minutes
         )
@@ -32,6 +92,7 @@ class CacheManager:
             'jira': config.get('jira_cache_ttl', 600),  # 10 minutes
             'code': config.get('code_cache_ttl', 3600),  # 1 hour
             'ai_response': config.get('ai_cache_ttl', 7200),  # 2 hours
+            'query': config.get('query_cache_ttl', 1800),  # 30 minutes
         }
     
     async def initialize(self):
@@ -51,7 +112,7 @@ class CacheManager:
                 logger.warning(f"Redis not available, using memory cache: {e}")
                 self.redis_client = None
     
-    async def get(self, key: str, cache_type: str = 'default') -> Optional[Any]:
+    async def get(self, key: Union[str, bytes], cache_type: str = 'default') -> Optional[Any]:
         """Get value from cache with fallback strategy"""
         cache_key = self._generate_key(key, cache_type)
         
@@ -99,13 +160,14 @@ class CacheManager:
         logger.debug(f"Cache miss: {cache_key}")
         return None
     
-    async def set(self, key: str, value: Any, cache_type: str = 'default') -> None:
-        """Set value in all available cache layers"""
+    async def set(self, key: Union[str, bytes], value: Any, cache_type: str = 'default', cost: float = 0.0) -> None:
+        """Set value in all available cache layers; cost (e.g. seconds to compute) guides memory eviction"""
         cache_key = self._generate_key(key, cache_type)
         ttl = self.cache_ttl.get(cache_type, 300)
         
         # Memory cache
         self.memory_cache[cache_key] = value
+        self.memory_cache.record_cost(cache_key, cost)
         
         # Redis cache
         if self.redis_client:
@@ -116,7 +178,7 @@ class CacheManager:
         
         logger.debug(f"Cache set: {cache_key}")
     
-    async def delete(self, key: str, cache_type: str = 'default') -> None:
+    async def delete(self, key: Union[str, bytes], cache_type: str = 'default') -> None:
         """Delete value from all cache layers"""
         cache_key = self._generate_key(key, cache_type)
         
@@ -195,9 +257,9 @@ class CacheManager:
         
         return stats
     
-    def _generate_key(self, key: str, cache_type: str) -> str:
+    def _generate_key(self, key: Union[str, bytes], cache_type: str) -> str:
         """Generate cache key with type prefix and hash"""
-        key_hash = hashlib.md5(key.encode()).hexdigest()[:12]
+        key_hash = hashlib.md5(key if isinstance(key, bytes) else key.encode()).hexdigest()[:12]
         return f"agent:{cache_type}:{key_hash}"
     
     async def _set_redis(self, cache_key: str, value: Any, cache_type: str) -> None:
@@ -1,11 +1,15 @@
 import asyncio
 import json
 import time
+import orjson
 import psutil
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest
@@ -14,6 +18,12 @@ from structlog.processors import JSONRenderer
 import colorlog
 
 
+def _orjson_dumps(event_dict: Dict[str, Any], **kwargs) -> str:
+    """Serialize a log event with orjson; the stdlib handlers downstream expect text"""
+    # Non-str keys are stringified, as json.dumps does, rather than raising
+    return orjson.dumps(event_dict, default=kwargs.get('default'), option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 @dataclass
 class MetricData:
     """Data structure for custom metrics"""
@@ -32,7 +42,9 @@ class LoggingManager:
         self.log_level = config.get('log_level', 'INFO')
         self.log_format = config.get('log_format', 'json')
         self.log_file = config.get('log_file', 'agent.log')
+        self.file_log_level = config.get('file_log_level', self.log_level)
         self.enable_structured_logging = config.get('enable_structured_logging', True)
+        self._queue_listener: Optional[QueueListener] = None
         
         self.setup_logging()
     
@@ -42,6 +54,9 @@ class LoggingManager:
         if self.enable_structured_logging:
             structlog.configure(
                 processors=[
+                    # Drop events below the logger's level before any other
+                    # processor timestamps or renders them
+                    structlog.stdlib.filter_by_level,
                     structlog.processors.TimeStamper(fmt="iso"),
                     structlog.stdlib.add_logger_name,
                     structlog.stdlib.add_log_level,
@@ -49,7 +64,7 @@ class LoggingManager:
                     structlog.processors.StackInfoRenderer(),
                     structlog.processors.format_exc_info,
                     structlog.processors.UnicodeDecoder(),
-                    JSONRenderer() if self.log_format == 'json' else structlog.dev.ConsoleRenderer()
+                    JSONRenderer(serializer=_orjson_dumps) if self.log_format == 'json' else structlog.dev.ConsoleRenderer()
                 ],
                 context_class=dict,
                 logger_factory=structlog.stdlib.LoggerFactory(),
@@ -81,7 +96,7 @@ class LoggingManager:
         # File handler
         file_handler = logging.FileHandler(self.log_file)
         file_handler.setFormatter(formatter)
-        file_handler.setLevel('DEBUG')  # Log everything to file
+        file_handler.setLevel(self.file_log_level)
         
         # Setup root logger
         root_logger = logging.getLogger()
@@ -93,6 +108,30 @@ class LoggingManager:
         # Setup specific loggers
         self._setup_component_loggers()
     
+    def start_queue_listener(self):
+        """Move the root handlers behind a queue drained by a background thread
+        
+        Logging calls then only enqueue a record, keeping console and file
+        writes off the event loop of long-running servers.
+        """
+        if self._queue_listener is not None:
+            return
+        
+        root_logger = logging.getLogger()
+        log_queue = queue.SimpleQueue()
+        self._queue_listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+        root_logger.handlers = [QueueHandler(log_queue)]
+        self._queue_listener.start()
+    
+    def stop_queue_listener(self):
+        """Flush queued records and hand the handlers back to the root logger"""
+        if self._queue_listener is None:
+            return
+        
+        self._queue_listener.stop()
+        logging.getLogger().handlers = list(self._queue_listener.handlers)
+        self._queue_listener = None
+    
     def _get_formatter(self) -> logging.Formatter:
         """Get appropriate formatter based on configuration"""
         if self.log_format == 'json':
@@ -107,14 +146,16 @@ class LoggingManager:
     
     def _setup_component_loggers(self):
         """Setup loggers for different components"""
-        components = [
-            'ai_client', 'mcp_client', 'code_reader', 'agent', 
-            'cache_manager', 'reliability', 'monitoring'
-        ]
+        # Parents of the names passed to structlog.get_logger across the
+        # package; their level is what filter_by_level checks
+        components = ['ai_agent', 'mcp', 'agent_monitor', 'ranking_engine']
         
+        # The root logger stays at DEBUG, so these levels decide what gets
+        # through; a more verbose file_log_level opens them up for the file
+        level = min(logging.getLevelName(self.log_level), logging.getLevelName(self.file_log_level))
         for component in components:
             logger = logging.getLogger(component)
-            logger.setLevel(self.log_level)
+            logger.setLevel(level)
 
 
 class MetricsCollector:
@@ -125,6 +166,10 @@ class MetricsCollector:
         self.registry = CollectorRegistry()
         self.custom_metrics: List[MetricData] = []
         
+        # Request observations waiting to be applied, keyed by (endpoint, status)
+        self._pending_requests: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        self.flush_task = None
+        
         # Core metrics
         self.request_count = Counter(
             'agent_requests_total',
@@ -188,9 +233,44 @@ class MetricsCollector:
         )
     
     def record_request(self, endpoint: str, status: str, duration: float):
-        """Record request metrics"""
-        self.request_count.labels(endpoint=endpoint, status=status).inc()
-        self.request_duration.labels(endpoint=endpoint).observe(duration)
+        """Record request metrics
+        
+        Observations are buffered and applied by flush_requests, so the
+        per-label lookups and locks are paid once per flush rather than
+        once per request.
+        """
+        self._pending_requests[(endpoint, status)].append(duration)
+    
+    def flush_requests(self):
+        """Apply buffered request observations to the Prometheus metrics"""
+        pending, self._pending_requests = self._pending_requests, defaultdict(list)
+        
+        for (endpoint, status), durations in pending.items():
+            self.request_count.labels(endpoint=endpoint, status=status).inc(len(durations))
+            histogram = self.request_duration.labels(endpoint=endpoint)
+            for duration in durations:
+                histogram.observe(duration)
+    
+    async def start_flushing(self):
+        """Start applying buffered request metrics periodically"""
+        self.flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop_flushing(self):
+        """Stop the periodic flush and apply whatever is still buffered"""
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        self.flush_requests()
+    
+    async def _flush_loop(self):
+        """Flush buffered request metrics until cancelled"""
+        while True:
+            await asyncio.sleep(self.config.get('metrics_flush_interval', 0.1))
+            self.flush_requests()
     
     def record_cache_hit(self, cache_type: str):
         """Record cache hit"""
@@ -243,6 +323,7 @@ class MetricsCollector:
     
     def get_metrics(self) -> str:
         """Get Prometheus-formatted metrics"""
+        self.flush_requests()
         return generate_latest(self.registry).decode('utf-8')
     
     def get_custom_metrics(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,190 @@
+"""
+Semantic Response Cache
+
+Caches complete query responses keyed by a vector of the query text, so a
+paraphrase of a recent query can reuse its response instead of re-running
+retrieval and synthesis.
+"""
+
+import copy
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Words of a query; those containing a digit (issue keys, status codes,
+# versions, ids) are identifiers, which must match exactly
+QUERY_TOKEN = re.compile(r'\w[\w.-]*')
+
+# Field of a result naming the Confluence page or JIRA issue it came from
+SOURCE_ID_FIELDS = {"confluence": "id", "jira": "key"}
+
+
+class SemanticCache:
+    """LRU/TTL response cache matched by cosine similarity of query vectors
+    
+    Queries are vectorized with hashed character trigrams and content words,
+    which needs no fitted model or embedding service, so rewordings and
+    reordered words land close together while a changed content word, such
+    as another service name, pulls the similarity below the threshold.
+    Entries only match queries made with the same search options and the
+    same identifiers (issue keys, numbers, status codes).
+    """
+    
+    def __init__(self,
+                 max_size: int = 1000,
+                 ttl: float = 300.0,
+                 threshold: float = 0.9,
+                 n_features: int = 2 ** 11):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self.char_vectorizer = HashingVectorizer(
+            analyzer='char_wb',
+            ngram_range=(3, 3),
+            n_features=n_features,
+            alternate_sign=False,
+            norm='l2'
+        )
+        self.word_vectorizer = HashingVectorizer(
+            analyzer=_content_words,
+            n_features=n_features,
+            alternate_sign=False,
+            norm='l2'
+        )
+        
+        # Row i of _vectors belongs to the entry in slot i; freed slots are reused
+        self._vectors = np.zeros((max_size, 2 * n_features), dtype=np.float32)
+        # slot -> (exact_key, stored_at, response, source_refs), LRU first
+        self._entries: OrderedDict = OrderedDict()
+        self._free_slots = list(range(max_size - 1, -1, -1))
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, query: str, options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached response for a query similar enough to this one"""
+        self._expire()
+        if not self._entries:
+            self.misses += 1
+            return None
+        
+        exact_key = _exact_key(query, options)
+        slots = [slot for slot, (key, _, _, _) in self._entries.items() if key == exact_key]
+        if not slots:
+            self.misses += 1
+            return None
+        
+        similarities = self._vectors[slots] @ self._vectorize(query)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+        
+        slot = slots[best]
+        self._entries.move_to_end(slot)
+        self.hits += 1
+        logger.debug("Semantic cache hit", similarity=float(similarities[best]))
+        return copy.deepcopy(self._entries[slot][2])
+    
+    def set(self, query: str, options: Optional[Dict[str, Any]], response: Dict[str, Any]) -> None:
+        """Cache a response for a query"""
+        self._expire()
+        if not self._free_slots:
+            self._release(next(iter(self._entries)))
+        
+        slot = self._free_slots.pop()
+        self._vectors[slot] = self._vectorize(query)
+        self._entries[slot] = (_exact_key(query, options), time.monotonic(), copy.deepcopy(response), source_refs(response))
+    
+    def invalidate_source(self, source: str, source_id: str) -> int:
+        """Drop every cached response built from a page or issue; returns how many were dropped"""
+        ref = (source, source_id)
+        stale = [slot for slot, (_, _, _, refs) in self._entries.items() if ref in refs]
+        for slot in stale:
+            self._release(slot)
+        return len(stale)
+    
+    def clear(self) -> None:
+        """Drop every cached response"""
+        for slot in list(self._entries):
+            self._release(slot)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def _vectorize(self, query: str) -> np.ndarray:
+        """Unit vector of a query: trigram and content-word vectors weighted equally"""
+        query = query.lower()
+        chars = self.char_vectorizer.transform([query]).toarray()[0]
+        words = self.word_vectorizer.transform([query]).toarray()[0]
+        # A query of only stop words and identifiers is matched on its trigrams
+        weight = np.sqrt(0.5) if words.any() else 0.0
+        return np.concatenate((np.sqrt(1.0 - weight ** 2) * chars, weight * words)).astype(np.float32)
+    
+    def _expire(self) -> None:
+        """Release entries older than the TTL"""
+        cutoff = time.monotonic() - self.ttl
+        for slot in [slot for slot, (_, stored_at, _, _) in self._entries.items() if stored_at < cutoff]:
+            self._release(slot)
+    
+    def _release(self, slot: int) -> None:
+        """Free a slot and its vector"""
+        del self._entries[slot]
+        self._vectors[slot] = 0.0
+        self._free_slots.append(slot)
+
+
+def _options_key(options: Optional[Dict[str, Any]]) -> str:
+    """Canonical form of search options, so equal options compare equal"""
+    return json.dumps(options or {}, sort_keys=True, default=str)
+
+
+def source_refs(response: Dict[str, Any]) -> FrozenSet[Tuple[str, str]]:
+    """(source, page id or issue key) of every Confluence and JIRA result in a response"""
+    sources = response.get('sources', {})
+    return frozenset(
+        (source, str(item[field]))
+        for source, field in SOURCE_ID_FIELDS.items()
+        for item in sources.get(source, {}).get('data', [])
+        if item.get(field)
+    )
+
+
+def _identifiers(query: str) -> FrozenSet[str]:
+    """Tokens of a query containing a digit, e.g. PROJ-1234, 500 or v2.1"""
+    return frozenset(
+        token.rstrip('.-').lower() for token in QUERY_TOKEN.findall(query)
+        if any(char.isdigit() for char in token)
+    )
+
+
+def _exact_key(query: str, options: Optional[Dict[str, Any]]) -> Tuple[str, FrozenSet[str]]:
+    """What a cached query must share exactly with a new one to be reused for it"""
+    return _options_key(options), _identifiers(query)
+
+
+def _content_words(query: str) -> List[str]:
+    """Lowercased words of a query other than stop words and identifiers, plurals folded"""
+    words = []
+    for token in QUERY_TOKEN.findall(query.lower()):
+        token = token.rstrip('.-')
+        if token in ENGLISH_STOP_WORDS or any(char.isdigit() for char in token):
+            continue
+        words.append(token[:-1] if len(token) > 3 and token.endswith('s') and not token.endswith('ss') else token)
+    return words
@@ -1,7 +1,7 @@
 import asyncio
 import json
 import pickle
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -12,6 +12,10 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Fields naming the Confluence page or JIRA issue a result came from, carried
+# through enhancement so cached responses can be traced back to their sources
+PRESERVED_ID_FIELDS = ('id', 'key')
+
 
 @dataclass
 class SearchResult:
@@ -371,9 +375,10 @@ class SemanticSearchEngine:
         
         return metadata
     
-    def _calculate_keyword_score(self, query: str, content: str) -> float:
-        """Calculate keyword matching score"""
-        query_words = set(query.lower().split())
+    def _calculate_keyword_score(self, query: str, content: str, query_words: Optional[FrozenSet[str]] = None) -> float:
+        """Calculate keyword matching score; query_words may be precomputed with _query_words(query)"""
+        if query_words is None:
+            query_words = _query_words(query)
         content_words = set(content.lower().split())
         
         if not query_words:
@@ -549,9 +554,17 @@ search_config = {
 semantic_search = SemanticSearchEngine(search_config)
 
 
+def _query_words(query: str) -> FrozenSet[str]:
+    """Distinct lowercased words of a query, as keyword scoring compares them"""
+    return frozenset(query.lower().split())
+
+
 async def enhance_search_results(results: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
     """Enhance search results using semantic search engine"""
     try:
+        # Every result is scored against the same query terms
+        query_words = _query_words(query)
+        
         # Convert results to SearchResult objects for processing
         search_results = []
         for result in results:
@@ -566,19 +579,19 @@ async def enhance_search_results(results: List[Dict[str, Any]], query: str) -> L
             )
             
             # Calculate enhanced scores
-            search_result.keyword_score = semantic_search._calculate_keyword_score(query, search_result.content)
+            search_result.keyword_score = semantic_search._calculate_keyword_score(query, search_result.content, query_words)
             search_result.freshness_score = semantic_search._calculate_freshness_score(search_result.metadata)
             search_result.popularity_score = semantic_search._calculate_popularity_score(search_result.metadata)
             search_result.combined_score = semantic_search._calculate_combined_score(search_result)
             
-            search_results.append(search_result)
+            search_results.append((search_result, result))
         
         # Sort by combined score
-        search_results.sort(key=lambda x: x.combined_score, reverse=True)
+        search_results.sort(key=lambda pair: pair[0].combined_score, reverse=True)
         
         # Convert back to dictionary format
         enhanced_results = []
-        for search_result in search_results:
+        for search_result, result in search_results:
             enhanced_result = {
                 'content': search_result.content,
                 'source': search_result.source,
@@ -593,6 +606,10 @@ async def enhance_search_results(results: List[Dict[str, Any]], query: str) -> L
                 'popularity_score': search_result.popularity_score,
                 'combined_score': search_result.combined_score
             }
+            # Keep the page id or issue key, which name the result's source
+            for field in PRESERVED_ID_FIELDS:
+                if field in result:
+                    enhanced_result[field] = result[field]
             enhanced_results.append(enhanced_result)
         
         return enhanced_results
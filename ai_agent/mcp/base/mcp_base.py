@@ -8,8 +8,10 @@ connecting to and communicating with MCP servers via WebSocket.
 import asyncio
 import json
 import time
+import orjson
 import websockets
-from typing import Dict, List, Any, Optional
+from websockets.exceptions import ConnectionClosed
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass
 import structlog
 
@@ -43,6 +45,11 @@ class MCPClient:
         self.config = config
         self.websocket = None
         self.request_id = 0
+        # Requests share the one websocket: each awaits the future registered
+        # under its id, which the reader task resolves when the reply arrives
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._notification_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
         self.connected = False
         self.connection_time = None
         self.request_count = 0
@@ -71,6 +78,7 @@ class MCPClient:
                 
                 self.connected = True
                 self.connection_time = time.time()
+                self._reader = asyncio.create_task(self._read_responses(self.websocket))
                 
                 self.logger.info("Successfully connected to MCP server")
                 return True
@@ -91,6 +99,10 @@ class MCPClient:
     
     async def disconnect(self) -> None:
         """Disconnect from MCP server"""
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        
         if self.websocket:
             try:
                 await self.websocket.close()
@@ -101,6 +113,62 @@ class MCPClient:
                 self.websocket = None
                 self.connected = False
                 self.connection_time = None
+        
+        self._fail_pending(MCPConnectionError("Disconnected from MCP server"))
+    
+    def on_notification(self, method: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a handler for server notifications of a method
+        
+        Args:
+            method: Notification method, e.g. "notifications/resources/updated"
+            handler: Called with the notification params on the reader task;
+                it must not block, so schedule any I/O as a task
+        """
+        self._notification_handlers.setdefault(method, []).append(handler)
+    
+    def _dispatch_notification(self, notification: Dict[str, Any]) -> None:
+        """Pass a server notification to the handlers registered for its method"""
+        for handler in self._notification_handlers.get(notification["method"], []):
+            try:
+                handler(notification.get("params") or {})
+            except Exception as e:
+                self.logger.warning(f"Notification handler failed: {str(e)}", method=notification["method"])
+    
+    async def _read_responses(self, websocket) -> None:
+        """Route each reply on the websocket to the request waiting for its id"""
+        try:
+            async for message in websocket:
+                try:
+                    response = orjson.loads(message)
+                except orjson.JSONDecodeError as e:
+                    self.error_count += 1
+                    self.logger.warning(f"Discarding invalid JSON from MCP server: {str(e)}")
+                    continue
+                
+                # Notifications carry a method but no id
+                if "id" not in response and "method" in response:
+                    self._dispatch_notification(response)
+                    continue
+                
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except ConnectionClosed:
+            pass
+        
+        # The server went away; fail whatever is still waiting so callers reconnect
+        if self.websocket is websocket:
+            self.websocket = None
+            self.connected = False
+        self._fail_pending(MCPConnectionError("WebSocket connection closed unexpectedly"))
+    
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a reply"""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
     
     async def send_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Send request to MCP server with error handling"""
@@ -109,10 +177,11 @@ class MCPClient:
         
         self.request_id += 1
         self.request_count += 1
+        request_id = self.request_id
         
         request = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": request_id,
             "method": method,
             "params": params
         }
@@ -121,17 +190,14 @@ class MCPClient:
             self.logger.debug(
                 f"Sending MCP request",
                 method=method,
-                request_id=self.request_id,
+                request_id=request_id,
                 params_keys=list(params.keys())
             )
             
+            reply = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = reply
             await self.websocket.send(json.dumps(request))
-            response_data = await asyncio.wait_for(
-                self.websocket.recv(),
-                timeout=self.config.timeout
-            )
-            
-            response = json.loads(response_data)
+            response = await asyncio.wait_for(reply, timeout=self.config.timeout)
             
             if "error" in response:
                 self.error_count += 1
@@ -140,14 +206,14 @@ class MCPClient:
                     f"MCP request failed",
                     method=method,
                     error=error_msg,
-                    request_id=self.request_id
+                    request_id=request_id
                 )
                 raise MCPRequestError(f"MCP request failed: {error_msg}")
             
             self.logger.debug(
                 f"MCP request successful",
                 method=method,
-                request_id=self.request_id
+                request_id=request_id
             )
             
             return response
@@ -155,16 +221,17 @@ class MCPClient:
         except asyncio.TimeoutError:
             self.error_count += 1
             raise MCPRequestError(f"Request timeout after {self.config.timeout}s")
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
             self.connected = False
             self.websocket = None
             raise MCPConnectionError("WebSocket connection closed unexpectedly")
-        except json.JSONDecodeError as e:
-            self.error_count += 1
-            raise MCPRequestError(f"Invalid JSON response: {str(e)}")
+        except MCPConnectionError:
+            raise
         except Exception as e:
             self.error_count += 1
             raise MCPRequestError(f"Request failed: {str(e)}")
+        finally:
+            self._pending.pop(request_id, None)
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on MCP connection"""
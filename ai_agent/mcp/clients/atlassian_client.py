@@ -11,6 +11,7 @@ import json
 import subprocess
 import tempfile
 import os
+import orjson
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 import structlog
@@ -293,7 +294,7 @@ class AtlassianMCPClient:
             
             # Read response
             response_data = await self.process.stdout.readline()
-            response = json.loads(response_data.decode().strip())
+            response = orjson.loads(response_data)
             
             if "error" in response:
                 error_msg = response["error"].get("message", "Unknown error")
@@ -342,6 +342,10 @@ class PluginManager:
         """Get plugin by name"""
         return self.plugins.get(plugin_name)
     
+    def has_handlers(self, event: PluginEvent) -> bool:
+        """Check whether any enabled plugin handles an event"""
+        return any(h.enabled for h in self.event_handlers.get(event, []))
+    
     async def execute_event_handlers(self, event: PluginEvent, context: PluginContext) -> PluginContext:
         """Execute all plugins registered for an event"""
         handlers = self.event_handlers.get(event, [])
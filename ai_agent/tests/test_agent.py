@@ -294,6 +294,71 @@ async def test_agent_initialization(mock_config):
         await agent.close()
 
 
+class TestSemanticCacheReuse:
+    """Test cases for which responses the semantic cache may replay"""
+    
+    @staticmethod
+    def _response(solution="Restart the auth service", confidence=0.7, total_results=3):
+        """process_query response with the fields the cache decision reads"""
+        return {
+            "solution": {"solution": solution, "confidence": confidence},
+            "metadata": {"total_results": total_results}
+        }
+    
+    def test_successful_synthesis_reused(self):
+        """Test that a confident answer built from results is cached"""
+        from ai_agent.core.agent import _reusable
+        
+        assert _reusable(self._response())
+    
+    @pytest.mark.parametrize("overrides", [
+        {"confidence": 0.0},
+        {"total_results": 0},
+        {"solution": "Error generating solution: timeout"},
+        {"solution": "Error generating AI response: 503 Service Unavailable"},
+        {"solution": "Partial answer\nError generating AI response: connection reset"},
+    ])
+    def test_failed_synthesis_not_reused(self, overrides):
+        """Test that failures and answers without results are never cached"""
+        from ai_agent.core.agent import _reusable
+        
+        assert not _reusable(self._response(**overrides))
+
+
+class TestConfidenceScore:
+    """Test cases for the confidence score of a synthesized solution"""
+    
+    @staticmethod
+    def _confidence(sources, complexity="medium"):
+        """Confidence score for search results given as source -> (relevance scores, query coverage)"""
+        all_data = {"sources": {
+            source: {"count": len(scores), "relevance_scores": scores, "query_coverage": coverage}
+            for source, (scores, coverage) in sources.items()
+        }}
+        return AIAgent._calculate_confidence_score(Mock(), all_data, {"complexity": complexity})
+    
+    def test_extra_source_never_lowers_confidence(self):
+        """Test that adding a weak hit from another source keeps or raises the score"""
+        strong_docs = {"confluence": ([0.9, 0.9, 0.9], [1.0, 1.0, 1.0])}
+        with_weak_code = {**strong_docs, "code": ([0.1], [0.2])}
+        
+        assert self._confidence(with_weak_code) >= self._confidence(strong_docs)
+    
+    def test_decisive_top_result_raises_confidence(self):
+        """Test that a source whose best result stands out counts more than a tied one"""
+        tied = {"jira": ([0.6, 0.6], [1.0, 1.0])}
+        decisive = {"jira": ([0.9, 0.3], [1.0, 1.0])}
+        
+        assert self._confidence(decisive) > self._confidence(tied)
+    
+    def test_score_bounds(self):
+        """Test the base score with no results and the clamp with strong results everywhere"""
+        strong = ([1.0], [1.0])
+        
+        assert self._confidence({}) == pytest.approx(0.3)
+        assert self._confidence({"confluence": strong, "jira": strong, "code": strong}, "low") == 1.0
+
+
 @pytest.mark.asyncio
 async def test_agent_close(ai_agent):
     """Test agent cleanup"""
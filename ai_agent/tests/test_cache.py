@@ -10,7 +10,7 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from cache_manager import CacheManager, SmartCache
+from ai_agent.infrastructure.cache_manager import CacheManager, CostAwareTTLCache, SmartCache
 
 
 @pytest.fixture
@@ -249,6 +249,81 @@ class TestSmartCache:
         assert result1 == result2
 
 
+class TestCostAwareTTLCache:
+    """Test cases for CostAwareTTLCache eviction"""
+    
+    def _full_cache(self, keys, candidate_fraction=1.0):
+        """Cache filled to its maxsize with one entry per key, oldest first"""
+        cache = CostAwareTTLCache(maxsize=len(keys), ttl=60, candidate_fraction=candidate_fraction)
+        for key in keys:
+            cache[key] = f"value-{key}"
+        return cache
+    
+    def test_costly_entry_survives_eviction(self):
+        """Test that the cheapest of the least recently used entries is evicted first"""
+        cache = self._full_cache(["a", "b", "c", "d"])
+        cache.record_cost("a", 5.0)
+        
+        cache["e"] = "value-e"
+        
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 4
+    
+    def test_frequently_hit_entry_survives_eviction(self):
+        """Test that hits count towards keeping an entry"""
+        cache = self._full_cache(["a", "b", "c", "d"])
+        for _ in range(3):
+            assert cache["b"] == "value-b"
+        assert cache.get("a") == "value-a"
+        
+        cache["e"] = "value-e"
+        
+        assert "a" in cache
+        assert "b" in cache
+        assert "c" not in cache
+    
+    def test_only_least_recently_used_are_candidates(self):
+        """Test that recently used entries are not evicted even when cheap"""
+        cache = self._full_cache(["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"], candidate_fraction=0.2)
+        cache.record_cost("a", 5.0)
+        cache.record_cost("b", 3.0)
+        
+        cache["k"] = "value-k"
+        
+        # Only a and b were candidates, and b is the cheaper of the two
+        assert "a" in cache
+        assert "b" not in cache
+        assert all(key in cache for key in "cdefghijk")
+    
+    def test_expire_delete_and_clear_drop_usage(self):
+        """Test that usage records leave the cache with their entries"""
+        cache = self._full_cache(["a", "b", "c"])
+        
+        del cache["a"]
+        assert "a" not in cache._usage
+        
+        expired = cache.expire(time.monotonic() + 120)
+        assert sorted(key for key, _ in expired) == ["b", "c"]
+        assert len(cache) == 0
+        assert not cache._usage
+        
+        cache["d"] = "value-d"
+        cache.clear()
+        assert not cache._usage
+    
+    def test_stays_within_maxsize(self):
+        """Test that repeated inserts never grow the cache past maxsize"""
+        cache = CostAwareTTLCache(maxsize=5, ttl=60)
+        for i in range(50):
+            cache[i] = i
+            cache.record_cost(i, float(i % 3))
+        
+        assert len(cache) == 5
+        assert len(cache._usage) == 5
+        assert set(cache._usage) == set(cache.keys())
+
+
 @pytest.mark.asyncio
 async def test_cache_manager_with_redis_config():
     """Test cache manager initialization with Redis config"""
@@ -261,7 +336,7 @@ async def test_cache_manager_with_redis_config():
         'redis_db': 0
     }
     
-    with patch('cache_manager.redis') as mock_redis:
+    with patch('ai_agent.infrastructure.cache_manager.redis') as mock_redis:
         # Mock Redis client
         mock_redis_client = AsyncMock()
         mock_redis_client.ping = AsyncMock(side_effect=Exception("Redis not available"))
@@ -0,0 +1,62 @@
+import pytest
+import io
+import sys
+import os
+from enum import Enum
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai_agent.api.serialization import dump_json, stream_json
+
+
+class Priority(Enum):
+    HIGH = "high"
+    LOW = 2
+
+
+@pytest.fixture
+def search_result():
+    """Search result with non-str keys at every streamed nesting level"""
+    return {
+        "query": "login fails",
+        "solution": {"solution": "Reset the token", "confidence": 0.8},
+        "sources": {
+            "confluence": {
+                "count": 1,
+                "data": [{"title": "Auth guide", 1: "int key", Priority.HIGH: "enum key"}],
+                "relevance_scores": [0.9]
+            },
+            "code": {"count": 0, "data": []},
+            Priority.LOW: {"count": 0, "data": []}
+        },
+        "search_strategy": {"file_types": ["python"], 2.5: None, True: "bool key"},
+        "metadata": {"tags": ("a", "b"), "when": None}
+    }
+
+
+class TestJsonOutput:
+    """Test cases for the search command's JSON output"""
+    
+    def test_stream_json_matches_dump_json(self, search_result):
+        """Test that --save-to output parses to the same value as stdout output"""
+        fh = io.BytesIO()
+        stream_json(search_result, fh)
+        
+        assert orjson.loads(fh.getvalue()) == orjson.loads(dump_json(search_result))
+    
+    def test_stream_json_non_str_keys(self, search_result):
+        """Test that non-str keys are written as orjson writes them"""
+        fh = io.BytesIO()
+        stream_json(search_result, fh)
+        streamed = orjson.loads(fh.getvalue())
+        
+        assert "2" in streamed["sources"]
+        assert streamed["sources"]["confluence"]["data"][0]["high"] == "enum key"
+        assert streamed["search_strategy"]["true"] == "bool key"
+    
+    def test_file_types_stay_a_list(self, search_result):
+        """Test that file types are written as a JSON list"""
+        assert orjson.loads(dump_json(search_result))["search_strategy"]["file_types"] == ["python"]
@@ -0,0 +1,124 @@
+import pytest
+import asyncio
+import sys
+import os
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai_agent.mcp.base.mcp_base import MCPClient, MCPConnectionConfig, MCPConnectionError
+
+
+class FakeWebSocket:
+    """In-memory websocket: records sent requests and yields queued server messages"""
+    
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+    
+    async def send(self, message):
+        self.sent.append(orjson.loads(message))
+    
+    def reply(self, message):
+        self.incoming.put_nowait(message if isinstance(message, (str, bytes)) else orjson.dumps(message))
+    
+    def close_from_server(self):
+        self.incoming.put_nowait(None)
+    
+    async def close(self):
+        self.close_from_server()
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+async def connected_client():
+    """MCP client attached to a fake websocket with its reader running"""
+    client = MCPClient(MCPConnectionConfig(server_url="ws://localhost", access_token="token", timeout=5.0))
+    websocket = FakeWebSocket()
+    client.websocket = websocket
+    client.connected = True
+    client._reader = asyncio.create_task(client._read_responses(websocket))
+    return client, websocket
+
+
+async def sent_requests(websocket, count):
+    """Wait until the client has sent count requests"""
+    while len(websocket.sent) < count:
+        await asyncio.sleep(0)
+    return websocket.sent
+
+
+class TestMCPClientReader:
+    """Test cases for routing websocket messages to requests and notification handlers"""
+    
+    @pytest.mark.asyncio
+    async def test_replies_routed_by_id(self):
+        """Test that concurrent requests each get their own reply when replies arrive out of order"""
+        client, websocket = await connected_client()
+        
+        first = asyncio.create_task(client.send_request("confluence.search", {"query": "a"}))
+        second = asyncio.create_task(client.send_request("jira.search", {"query": "b"}))
+        requests = await sent_requests(websocket, 2)
+        
+        websocket.reply({"jsonrpc": "2.0", "id": requests[1]["id"], "result": "b"})
+        websocket.reply({"jsonrpc": "2.0", "id": requests[0]["id"], "result": "a"})
+        
+        assert (await first)["result"] == "a"
+        assert (await second)["result"] == "b"
+        assert client._pending == {}
+        await client.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_notification_dispatched_to_handlers(self):
+        """Test that notifications reach the handlers for their method and leave requests waiting"""
+        client, websocket = await connected_client()
+        received = []
+        client.on_notification("notifications/resources/updated", received.append)
+        client.on_notification("notifications/other", lambda params: received.append("other"))
+        
+        request = asyncio.create_task(client.send_request("server.status", {}))
+        requests = await sent_requests(websocket, 1)
+        
+        websocket.reply({"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": "jira://issue/PROJ-1"}})
+        websocket.reply({"jsonrpc": "2.0", "id": requests[0]["id"], "result": {}})
+        
+        assert (await request)["result"] == {}
+        assert received == [{"uri": "jira://issue/PROJ-1"}]
+        await client.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_failing_handler_does_not_stop_reader(self):
+        """Test that an exception in a notification handler is logged, not raised"""
+        client, websocket = await connected_client()
+        client.on_notification("notifications/resources/updated", lambda params: 1 / 0)
+        
+        request = asyncio.create_task(client.send_request("server.status", {}))
+        requests = await sent_requests(websocket, 1)
+        websocket.reply({"jsonrpc": "2.0", "method": "notifications/resources/updated"})
+        websocket.reply("not json")
+        websocket.reply({"jsonrpc": "2.0", "id": requests[0]["id"], "result": "ok"})
+        
+        assert (await request)["result"] == "ok"
+        await client.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_closed_connection_fails_pending_requests(self):
+        """Test that requests waiting on a closed connection fail instead of timing out"""
+        client, websocket = await connected_client()
+        
+        request = asyncio.create_task(client.send_request("server.status", {}))
+        await sent_requests(websocket, 1)
+        websocket.close_from_server()
+        
+        with pytest.raises(MCPConnectionError):
+            await request
+        assert not client.connected
@@ -1,4 +1,5 @@
 import pytest
+import pytest_asyncio
 import asyncio
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock, patch
@@ -484,5 +485,178 @@ class TestAPIValidation:
             SemanticSearchRequest(query="test", min_score=1.5)
 
 
+class TestInFlightQueries:
+    """Test cases for sharing one answer between concurrent /search requests"""
+    
+    @staticmethod
+    def _counting_answer(calls, release, result=None, error=None):
+        """Answer factory that records each call and finishes once release is set"""
+        async def answer():
+            calls.append(1)
+            await release.wait()
+            if error is not None:
+                raise error
+            return result
+        return answer
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_answer(self):
+        """Test that concurrent requests for one key run the answer once"""
+        from ai_agent.api.web_api import InFlightQueries
+        
+        in_flight, calls, release = InFlightQueries(), [], asyncio.Event()
+        answer = self._counting_answer(calls, release, result={"solution": "shared"})
+        
+        waiters = [asyncio.create_task(in_flight.run(b"key", answer)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await asyncio.gather(*waiters) == [{"solution": "shared"}] * 5
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_keys_answered_separately_and_rerun_after_completion(self):
+        """Test that other keys, and later requests for a finished key, get their own answer"""
+        from ai_agent.api.web_api import InFlightQueries
+        
+        in_flight, calls, release = InFlightQueries(), [], asyncio.Event()
+        release.set()
+        answer = self._counting_answer(calls, release, result={})
+        
+        await asyncio.gather(in_flight.run(b"first", answer), in_flight.run(b"second", answer))
+        await in_flight.run(b"first", answer)
+        
+        assert len(calls) == 3
+        assert in_flight._pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test that a disconnecting client leaves the shared answer running"""
+        from ai_agent.api.web_api import InFlightQueries
+        
+        in_flight, calls, release = InFlightQueries(), [], asyncio.Event()
+        answer = self._counting_answer(calls, release, result={"solution": "shared"})
+        
+        leaving = asyncio.create_task(in_flight.run(b"key", answer))
+        staying = asyncio.create_task(in_flight.run(b"key", answer))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        release.set()
+        
+        assert await staying == {"solution": "shared"}
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+    
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self):
+        """Test that a failed answer fails all its waiters and is not reused"""
+        from ai_agent.api.web_api import InFlightQueries
+        
+        in_flight, calls, release = InFlightQueries(), [], asyncio.Event()
+        answer = self._counting_answer(calls, release, error=RuntimeError("backend down"))
+        
+        waiters = [asyncio.create_task(in_flight.run(b"key", answer)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1
+        assert in_flight._pending == {}
+
+
+@pytest_asyncio.fixture
+async def source_cache(tmp_path, monkeypatch):
+    """Real cache manager and an empty source index installed in the web API module"""
+    from ai_agent.api import web_api
+    from ai_agent.infrastructure.cache_manager import CacheManager
+    from cachetools import TTLCache
+    
+    manager = CacheManager({'file_cache_dir': str(tmp_path), 'use_redis': False})
+    await manager.initialize()
+    monkeypatch.setattr(web_api, 'cache_manager', manager)
+    monkeypatch.setattr(web_api, '_cached_by_source', TTLCache(maxsize=100, ttl=60))
+    yield manager
+    await manager.close()
+
+
+class TestSourceInvalidation:
+    """Test cases for dropping cached /search responses when a source changes"""
+    
+    @pytest.mark.asyncio
+    async def test_notification_evicts_cached_response(self, source_cache, monkeypatch):
+        """Test that a resource update from the MCP server deletes the responses built from it"""
+        from ai_agent.api import web_api
+        from ai_agent.mcp.base.mcp_base import MCPClient, MCPConnectionConfig
+        
+        client = MCPClient(MCPConnectionConfig(server_url="ws://localhost", access_token="token"))
+        monkeypatch.setattr(web_api, 'agent_instance', Mock(confluence_client=client, jira_client=client))
+        web_api._subscribe_to_source_updates()
+        
+        response_data = {
+            'sources': {
+                'confluence': {'count': 1, 'data': [{'id': '123456', 'url': 'https://wiki/pages/123456'}]},
+                'jira': {'count': 1, 'data': [{'key': 'PROJ-1', 'url': 'https://jira/browse/PROJ-1'}]}
+            }
+        }
+        await source_cache.set(b'first', response_data, 'ai_response')
+        await source_cache.set(b'second', {'sources': {}}, 'ai_response')
+        web_api._index_sources(b'first', response_data)
+        
+        client._dispatch_notification({
+            "method": web_api.RESOURCE_UPDATED,
+            "params": {"uri": "jira://issue/PROJ-1"}
+        })
+        await asyncio.gather(*web_api._background_tasks)
+        
+        assert await source_cache.get(b'first', 'ai_response') is None
+        assert await source_cache.get(b'second', 'ai_response') is not None
+        web_api.agent_instance.forget_source.assert_called_with("jira", "PROJ-1")
+    
+    @pytest.mark.asyncio
+    async def test_unrelated_notification_keeps_cached_response(self, source_cache):
+        """Test that an update to another page leaves cached responses alone"""
+        from ai_agent.api import web_api
+        
+        response_data = {'sources': {'confluence': {'data': [{'id': '123456'}]}}}
+        await source_cache.set(b'first', response_data, 'ai_response')
+        web_api._index_sources(b'first', response_data)
+        
+        web_api._on_source_updated('confluence', {'uri': 'confluence://page/654321'})
+        web_api._on_source_updated('jira', {'uri': 'jira://issue/123456'})
+        await asyncio.gather(*web_api._background_tasks)
+        
+        assert await source_cache.get(b'first', 'ai_response') is not None
+    
+    def test_index_entry_outlives_newest_response(self, monkeypatch):
+        """Test that indexing another response from a page restarts the page's TTL"""
+        from ai_agent.api import web_api
+        from cachetools import TTLCache
+        
+        now = [0.0]
+        index = TTLCache(maxsize=100, ttl=10, timer=lambda: now[0])
+        monkeypatch.setattr(web_api, '_cached_by_source', index)
+        response_data = {'sources': {'jira': {'data': [{'key': 'PROJ-1'}]}}}
+        
+        web_api._index_sources(b'first', response_data)
+        now[0] = 8.0
+        web_api._index_sources(b'second', response_data)
+        now[0] = 12.0
+        
+        assert index[('jira', 'PROJ-1')] == {b'first', b'second'}
+    
+    @pytest.mark.asyncio
+    async def test_enhanced_results_keep_source_ids(self):
+        """Test that semantic enhancement keeps the page id and issue key of each result"""
+        from ai_agent.infrastructure.semantic_search import enhance_search_results
+        
+        results = await enhance_search_results([
+            {'id': '123456', 'title': 'Login guide', 'content': 'login token'},
+            {'key': 'PROJ-1', 'title': 'Login bug', 'content': 'login fails'}
+        ], "login")
+        
+        assert {result.get('id') or result.get('key') for result in results} == {'123456', 'PROJ-1'}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -9,6 +9,7 @@ Examples:
     python start_api.py
     python start_api.py --host 0.0.0.0 --port 8080
     python start_api.py --debug
+    python start_api.py --workers 4
 """
 
 import sys
@@ -26,7 +27,8 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
     
     args = parser.parse_args()
     
-    run_server(host=args.host, port=args.port, debug=args.debug)
\ No newline at end of file
+    run_server(host=args.host, port=args.port, debug=args.debug, workers=args.workers)
\ No newline at end of file